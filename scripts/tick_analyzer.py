@@ -29,26 +29,61 @@ python -m scripts.tick_analyzer \
 
 Dependencies
 ~~~~~~~~~~~~
-* `polars>=0.20`, `pyarrow`
+* `polars>=1.25` (streaming engine), `pyarrow`, `numpy`
 * `matplotlib` only when `--plot` or `--save` is requested
 """
 from __future__ import annotations
 
 import argparse
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List, Optional
 
+import numpy as np
 import polars as pl
 
 # ---------------------------------------------------------------------------
 # helpers
 # ---------------------------------------------------------------------------
 
+# bucket start stamped into FileSink shard names
+_SHARD_TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2})")
+
+# bar size units understood by --bar
+_BAR_UNITS_MS = {"ms": 1, "s": 1000, "m": 60_000, "min": 60_000, "h": 3_600_000, "d": 86_400_000}
+_BAR_RE = re.compile(r"^\s*(\d+)\s*(ms|s|min|m|h|d)\s*$")
+
+# max concurrent footer/header reads when fingerprinting shards
+_IO_WORKERS = 16
+
+# columns actually needed per event (trade → bars, ticker/depth → price line)
+_COLUMNS = {
+    "trade":  ["timestamp", "price", "qty"],
+    "ticker": ["timestamp", "price"],
+    "depth":  ["timestamp", "price"],
+}
+
+# rows per row group in --out parquet files
+_ROW_GROUP = 128 * 1024
+
+# longer series are LTTB‑downsampled to _PLOT_POINTS before plotting
+_PLOT_MAX_RAW = 5000
+_PLOT_POINTS = 2000
+
 def _parse_dt(dt_str: str) -> datetime:
     return datetime.fromisoformat(dt_str).astimezone(timezone.utc)
 
 
+def _parse_shard_ts(path: Path) -> Optional[datetime]:
+    """Bucket start encoded in a FileSink shard name, e.g. ``trade_2025-04-21_11-05``."""
+    m = _SHARD_TS_RE.search(path.stem)
+    if not m:
+        return None
+    return datetime.strptime(m.group(1), "%Y-%m-%d_%H-%M").replace(tzinfo=timezone.utc)
+
+
 def _bucket_files(base: Path, sym: str, event: str, start: datetime, end: datetime) -> List[Path]:
     files: List[Path] = []
     date_range = pl.date_range(start.date(), end.date(), interval="1d", eager=True)
@@ -56,20 +91,76 @@ def _bucket_files(base: Path, sym: str, event: str, start: datetime, end: dateti
         folder = base / sym / event / day.strftime("%Y/%m/%d")
         if folder.is_dir():
             files.extend(p for p in folder.iterdir() if p.suffix in (".parquet", ".csv"))
-    return sorted(files)
+
+    # prune by the bucket start in the file name – zero bytes read for shards
+    # outside the window.  A shard covers [its start, next shard's start), so
+    # keep those starting inside (start, end] plus the last one at/before
+    # start.  Unrecognised names are kept; row‑group stats prune them later.
+    stamps = {p: _parse_shard_ts(p) for p in files}
+    floor = max((t for t in stamps.values() if t is not None and t <= start), default=None)
+    return sorted(
+        p for p, t in stamps.items()
+        if t is None or (t <= end and (t > start or t == floor))
+    )
+
+
+def _shard_key(path: Path) -> tuple:
+    """Schema fingerprint of one shard: Parquet footer schema or CSV header."""
+    if path.suffix == ".parquet":
+        return (".parquet", tuple(pl.read_parquet_schema(path).items()))
+    with path.open("r", encoding="utf-8") as fh:
+        return (".csv", fh.readline().strip())
 
 
-def _read_concat(files: List[Path]) -> pl.DataFrame:
+def _read_concat(files: List[Path], start_ms: int, end_ms: int,
+                 columns: Optional[List[str]] = None,
+                 low_memory: bool = False) -> pl.LazyFrame:
+    """Lazily scan *files* as one plan with the time window (and optional
+    column projection) pushed down into the readers.
+
+    Shard footers/headers are fetched concurrently; shards sharing a schema
+    go into a single multi‑file scan (read in parallel by Polars) and only
+    the distinct schema groups are concatenated diagonally.
+
+    *low_memory* makes the readers decode one row group / CSV chunk at a
+    time, capping peak RAM near the projected size of a single batch
+    instead of whole shards (slower, as files are no longer read in
+    parallel).
+    """
     if not files:
         raise FileNotFoundError("No files found for the given window.")
-    parts = [pl.read_parquet(f) if f.suffix == ".parquet" else pl.read_csv(f) for f in files]
-    return pl.concat(parts, how="vertical_relaxed")
+    with ThreadPoolExecutor(max_workers=min(_IO_WORKERS, len(files))) as ex:
+        keys = list(ex.map(_shard_key, files))
+
+    groups: Dict[tuple, List[Path]] = {}
+    for key, f in zip(keys, files):
+        groups.setdefault(key, []).append(f)
+    parts = [pl.scan_parquet(fs, low_memory=low_memory) if key[0] == ".parquet"
+             else pl.scan_csv(fs, low_memory=low_memory)
+             for key, fs in groups.items()]
 
+    lf = parts[0] if len(parts) == 1 else pl.concat(parts, how="diagonal_relaxed").sort("timestamp")
+    lf = lf.filter(pl.col("timestamp").is_between(start_ms, end_ms))
+    if columns:
+        lf = lf.select(columns)
+    return lf
 
-def _resample_trade(df: pl.DataFrame, every: str) -> pl.DataFrame:
-    df = df.with_columns(pl.col("timestamp").cast(pl.Int64))
+
+def _bar_ms(every: str) -> int:
+    """Bar size string → milliseconds: ``"100ms"``, ``"1s"``, ``"5min"``, ``"1h"``…"""
+    m = _BAR_RE.match(every)
+    if not m or int(m.group(1)) == 0:
+        raise ValueError(f"unsupported bar size: {every!r}")
+    return int(m.group(1)) * _BAR_UNITS_MS[m.group(2)]
+
+
+def _resample_trade(lf: pl.LazyFrame, every: str) -> pl.LazyFrame:
+    # fixed‑width bars → plain integer bucket key; no dynamic windowing needed
+    bar_ms = _bar_ms(every)
     bars = (
-        df.groupby_dynamic(index_column="timestamp", every=every, closed="left")
+        lf.with_columns(pl.col("timestamp").cast(pl.Int64))
+          .sort("timestamp")
+          .group_by((pl.col("timestamp") // bar_ms * bar_ms).alias("timestamp"), maintain_order=True)
           .agg([
               pl.col("price").first().alias("open"),
               pl.col("price").max().alias("high"),
@@ -84,6 +175,38 @@ def _resample_trade(df: pl.DataFrame, every: str) -> pl.DataFrame:
     )
     return bars
 
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int):
+    """
+    Largest‑Triangle‑Three‑Buckets downsampling of a series to *n_out* points.
+
+    First and last points are kept; every bucket in between contributes the
+    point forming the largest triangle with the previously chosen point and
+    the mean of the next bucket, which preserves the visual shape (spikes
+    included) far better than striding.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # n_out - 2 buckets over x[1 : n-1]; spacing ≥ 1 so none is empty
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nlo, nhi = hi, edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -95,8 +218,10 @@ def main(argv=None):
     p.add_argument("--event", required=True, choices=["trade", "ticker", "depth"], help="event type to load")
     p.add_argument("--from", dest="start", required=True, help="UTC start time ISO e.g. '2025-04-21 10:00'")
     p.add_argument("--to", dest="end", required=True, help="UTC end time ISO")
-    p.add_argument("--bar", default="1s", help="bar size for trade resample (1s,5s,1min…)")
+    p.add_argument("--bar", default="1s", help="bar size for trade resample (100ms,1s,5s,1min,1h…)")
     p.add_argument("--out", help="export DataFrame to parquet/csv path")
+    p.add_argument("--low-memory", action="store_true",
+                   help="read shards row group by row group to cap peak RAM")
     p.add_argument("--plot", action="store_true", help="show interactive plot")
     p.add_argument("--save", help="save plot to image file (png/pdf/svg)")
     args = p.parse_args(argv)
@@ -106,29 +231,42 @@ def main(argv=None):
     end    = _parse_dt(args.end)
 
     files  = _bucket_files(base, args.symbol, args.event, start, end)
-    df     = _read_concat(files)
+    # trade bars only need ts/price/qty; raw ticker/depth exports keep every column
+    cols   = _COLUMNS[args.event] if args.event == "trade" or not args.out else None
+    lf     = _read_concat(files, int(start.timestamp()*1000), int(end.timestamp()*1000), cols,
+                          low_memory=args.low_memory)
 
     if args.event == "trade":
-        df = _resample_trade(df, args.bar)
-    df = df.filter((pl.col("timestamp") >= int(start.timestamp()*1000)) &
-                   (pl.col("timestamp") <= int(end.timestamp()*1000)))
+        lf = _resample_trade(lf, args.bar)
 
     # ---------------- export ----------------
+    if args.out and not (args.plot or args.save):
+        # nothing else needs the frame → stream straight to disk
+        if args.out.endswith(".parquet"):
+            lf.sink_parquet(args.out, compression="zstd", row_group_size=_ROW_GROUP)
+        else:
+            lf.sink_csv(args.out)
+        return
+
+    df = lf.collect(engine="streaming")
     if args.out:
         if args.out.endswith(".parquet"):
-            df.write_parquet(args.out)
+            df.write_parquet(args.out, compression="zstd", row_group_size=_ROW_GROUP)
         else:
             df.write_csv(args.out)
 
     # ---------------- plot ------------------
     if args.plot or args.save:
         import matplotlib.pyplot as plt
-        ts = df["timestamp"].to_numpy() / 1000
-        if args.event == "trade":
-            plt.plot(ts, df["close"], label="close")
-        else:
-            col = "price" if "price" in df.columns else df.columns[1]
-            plt.plot(ts, df[col], label=col)
+        col = "close" if args.event == "trade" else ("price" if "price" in df.columns else df.columns[1])
+        # one conversion for both axes (column‑major, so each slice is contiguous)
+        arr = df.select(["timestamp", col]).to_numpy(order="fortran")
+        ts = arr[:, 0] * 1e-3
+        ys = arr[:, 1]
+        if len(ts) > _PLOT_MAX_RAW:
+            ts, ys = _lttb(ts, ys, _PLOT_POINTS)
+        plt.figure(figsize=(12, 4))
+        plt.plot(ts, ys, label=col, rasterized=True)
         plt.legend(); plt.title(f"{args.symbol} {args.event}")
         plt.xlabel("unix time (s)")
         if args.save:
@@ -0,0 +1,68 @@
+"""
+Numeric kernels for AlertEngine's per‑tick threshold checks.
+
+Compiled with Numba when it is installed; otherwise the very same
+functions run as plain Python, so behaviour never depends on the JIT.
+Kernels live at module scope (no closures) so Numba can cache them.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit
+except ImportError:  # pure‑Python fallback – same semantics, just slower
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+__all__ = ["check_kernel"]
+
+
+@njit(cache=True)
+def _bisect_right(buf, x, lo, hi):
+    """Index after the last element of sorted ``buf[lo:hi]`` that is ≤ *x*."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < buf[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+@njit(cache=True)
+def check_kernel(ts_buf, px_buf, head, tail, now, price,
+                 w24, w_short, pct_24h, pct_short, cooldown, last24, last_short):
+    """
+    Evaluate both windows for the tick already stored at ``tail - 1``.
+
+    Returns ``(hit_24h, pct_24h, ref_24h, hit_short, pct_short, ref_short,
+    last24, last_short)`` where the two ``last*`` values are the updated
+    cool‑down stamps (moved to *now* on a hit).
+    """
+    hit24 = False
+    pct24 = 0.0
+    ref24 = 0.0
+    i = _bisect_right(ts_buf, now - w24, head, tail) - 1
+    if i >= head:
+        ref24 = px_buf[i]
+        if ref24 != 0.0:
+            pct24 = (price - ref24) / ref24
+            if abs(pct24) >= pct_24h and now - last24 >= cooldown:
+                hit24 = True
+                last24 = now
+
+    hit_s = False
+    pct_s = 0.0
+    ref_s = 0.0
+    i = _bisect_right(ts_buf, now - w_short, head, tail) - 1
+    if i >= head:
+        ref_s = px_buf[i]
+        if ref_s != 0.0:
+            pct_s = (price - ref_s) / ref_s
+            if abs(pct_s) >= pct_short and now - last_short >= cooldown:
+                hit_s = True
+                last_short = now
+
+    return hit24, pct24, ref24, hit_s, pct_s, ref_s, last24, last_short
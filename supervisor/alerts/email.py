@@ -8,6 +8,7 @@ import asyncio
 import logging
 import smtplib
 import ssl
+import threading
 from email.message import EmailMessage
 from typing import Dict, List, Optional
 
@@ -27,6 +28,9 @@ class EmailSender:
     use_ssl     : bool  – override port heuristic (optional)
     """
 
+    # close the cached SMTP connection after this long without a send
+    IDLE_TIMEOUT_S = 300
+
     def __init__(self, config: Optional[Dict] = None):
         cfg = config or {}
 
@@ -42,6 +46,11 @@ class EmailSender:
         self.from_addr: str = cfg.get("from_addr") or self.username or "alerts@localhost"
         self.to_addrs: List[str] = cfg.get("to_addrs", [])
 
+        # persistent connection, shared by the to_thread workers
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+
         self.logger = logging.getLogger(self.__class__.__name__)
         if not self.to_addrs:
             self.logger.warning("EmailSender initialised with no recipients")
@@ -65,6 +74,22 @@ class EmailSender:
 
         return await asyncio.to_thread(self._send_sync, msg)
 
+    async def send_many(self, alerts: List[Dict[str, str]]) -> bool:
+        """
+        Fuse several ``{"subject", "message"}`` alerts into one e‑mail.
+
+        A single alert is sent unchanged; otherwise the subject becomes
+        ``"[N alerts] <first subject>"`` and the body lists every alert.
+        """
+        if not alerts:
+            return True
+        if len(alerts) == 1:
+            return await self.send(alerts[0]["subject"], alerts[0]["message"])
+
+        subject = f"[{len(alerts)} alerts] {alerts[0]['subject']}"
+        body = "\n\n".join(f"{a['subject']}\n{a['message']}" for a in alerts)
+        return await self.send(subject, body)
+
     # ------------------------------------------------------------------ #
     # internal synchronous part                                          #
     # ------------------------------------------------------------------ #
@@ -72,30 +97,80 @@ class EmailSender:
         """
         Blocking SMTP logic; returns True/False instead of raising so
         async wrapper may decide about retries/logging.
-        """
-        try:
-            if self.use_ssl:
-                smtp_cls = smtplib.SMTP_SSL
-                context = ssl.create_default_context()
-                server = smtp_cls(self.smtp_host, self.smtp_port, context=context, timeout=15)
-            else:
-                smtp_cls = smtplib.SMTP
-                server = smtp_cls(self.smtp_host, self.smtp_port, timeout=15)
-
-            with server as smtp:
-                smtp.ehlo()
-                if not self.use_ssl and smtp.has_extn("STARTTLS"):
-                    smtp.starttls(context=ssl.create_default_context())
-                    smtp.ehlo()
 
-                if self.username and self.password:
-                    smtp.login(self.username, self.password)
+        Reuses one authenticated connection across calls (validated with
+        NOOP); it is dropped on any error and closed after IDLE_TIMEOUT_S
+        without traffic.
+        """
+        with self._smtp_lock:
+            self._cancel_idle_timer()
+            try:
+                self._get_conn().send_message(msg)
+            except Exception as exc:  # noqa: BLE001
+                self._drop_conn()
+                self.logger.error("Failed to send e‑mail: %s", exc)
+                return False
+            self._arm_idle_timer()
+
+        self.logger.info("E‑mail sent → %s", msg["Subject"])
+        return True
 
-                smtp.send_message(msg)
+    # ------------------------------------------------------------------ #
+    # connection management                                              #
+    # ------------------------------------------------------------------ #
+    def close(self) -> None:
+        """Close the cached SMTP connection (if any)."""
+        with self._smtp_lock:
+            self._cancel_idle_timer()
+            self._drop_conn()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            context = ssl.create_default_context()
+            smtp = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=context, timeout=15)
+        else:
+            smtp = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=15)
 
-            self.logger.info("E‑mail sent → %s", msg["Subject"])
-            return True
+        try:
+            smtp.ehlo()
+            if not self.use_ssl and smtp.has_extn("STARTTLS"):
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
 
-        except Exception as exc:  # noqa: BLE001
-            self.logger.error("Failed to send e‑mail: %s", exc)
-            return False
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _get_conn(self) -> smtplib.SMTP:
+        """Return a live connection, reconnecting if the cached one went stale."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop_conn()
+        self._smtp = self._connect()
+        return self._smtp
+
+    def _drop_conn(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def _arm_idle_timer(self) -> None:
+        self._idle_timer = threading.Timer(self.IDLE_TIMEOUT_S, self.close)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
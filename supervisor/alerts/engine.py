@@ -4,16 +4,46 @@ AlertEngine v2  –  Threshold checks with cool‑down & improved lookup logic.
 
 from __future__ import annotations
 
+import asyncio
 import bisect
 import logging
 import time
+from array import array
 from collections import deque
-from typing import Deque, Dict, List, Tuple
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Sequence, Set, Tuple
 
+from supervisor.alerts._kernels import check_kernel
 from supervisor.alerts.email import EmailSender
 
 PRICE = float
 TS = int
+AlertCallback = Callable[[str, str, List[Dict[str, str]]], Awaitable[None]]
+
+# alert texts as bound str.format templates (the short‑window pair is built
+# per engine with its window length baked in)
+_SUBJ_24H = "{symbol} moved {pct:+.2%} over 24 h".format
+_MSG_24H = (
+    "{exchange}:{symbol} price is {price:.8g}, "
+    "{pct:+.2%} versus 24 h ago ({ref:.8g})."
+).format
+
+# compact a history buffer once this many stale entries sit before its head
+_COMPACT_MIN = 4096
+
+
+class SymbolState:
+    """Per‑(exchange, symbol) history and cool‑down stamps, one object per pair."""
+
+    __slots__ = ("ts", "px", "head", "last24", "last_short", "last_price", "last_checked")
+
+    def __init__(self):
+        self.ts = array("q")      # tick timestamps (ms), ascending
+        self.px = array("d")      # prices aligned with ts
+        self.head = 0             # first live index (entries before it are pruned)
+        self.last24: TS = 0       # last 24 h alert
+        self.last_short: TS = 0   # last short‑window alert
+        self.last_price: PRICE = 0.0
+        self.last_checked: TS = 0
 
 
 class AlertEngine:
@@ -28,12 +58,35 @@ class AlertEngine:
         pct_short         : float  –  e.g. 0.02  (2 %)
         window_short_ms   : int    –  default 1h
         cooldown_ms       : int    –  suppress repeat alerts for this period (default = window_short_ms)
+        recheck_ms        : int    –  max gap between full evaluations while the
+                                      price stays put (default = cooldown_ms / 4)
+
+    max_history           : int    –  ticks kept per pair (default 500 000); on
+                                      faster feeds the oldest are dropped, so a
+                                      window reaching past them finds no reference
 
     email:
         … passed straight through to EmailSender
+
+    batch:
+        flush_ms          : int    –  debounce window for fusing alerts (default 500)
+        max_batch         : int    –  max alerts per e‑mail (default 50)
+        max_queued        : int    –  outbox size beyond which :meth:`enqueue`
+                                      drops alerts (default 1000)
+
+    feed:
+        max_batch         : int    –  max ticks evaluated per pass of :meth:`feed`'s
+                                      background task (default 500)
+        max_queued        : int    –  ticks waiting before :meth:`feed` drops
+                                      (default 65 536, counted in ``feed_dropped``)
     """
 
-    def __init__(self, config: Dict):
+    def __init__(
+        self,
+        config: Dict,
+        pairs: Iterable[Tuple[str, str]] = (),
+        on_alerts: AlertCallback | None = None,
+    ):
         th = config.get("thresholds", {})
 
         self.pct_24h = th.get("pct_24h", 0.05)
@@ -44,13 +97,53 @@ class AlertEngine:
 
         self.cooldown = th.get("cooldown_ms", self.w_short)
 
-        # history: (exchange, symbol) -> deque[(ts, price)]
-        self.history: Dict[Tuple[str, str], Deque[Tuple[TS, PRICE]]] = {}
+        self._mins_short = self.w_short / 60_000
+        self._subj_short = f"{{symbol}} moved {{pct:+.2%}} in {self._mins_short:.0f} min".format
+        self._msg_short = (
+            "{exchange}:{symbol} price is {price:.8g}, "
+            f"{{pct:+.2%}} within the last {self._mins_short:.0f} minutes "
+            "(was {ref:.8g})."
+        ).format
+
+        # history older than this is only kept as the widest window's reference
+        self._horizon = max(self.w24, self.w_short)
+        # …and never more than this many ticks per pair
+        self.max_history = config.get("max_history", 500_000)
 
-        # last‑alert map: (exchange, symbol, "24h"/"short") -> last_ts
-        self.last_alert: Dict[Tuple[str, str, str], TS] = {}
+        # early‑out: skip the window lookups while the price is within the
+        # smallest threshold of the last fully evaluated price, but never
+        # for longer than recheck_ms (the reference prices slide meanwhile)
+        self._min_pct = min(self.pct_24h, self.pct_short)
+        self.recheck_ms = th.get("recheck_ms", self.cooldown // 4)
+
+        # (exchange, symbol) -> state; configured pairs are built up front,
+        # anything else on its first tick
+        self.states: Dict[Tuple[str, str], SymbolState] = {
+            key: SymbolState() for key in pairs
+        }
 
         self.email_sender = EmailSender(config.get("email", {}))
+
+        # outgoing alerts wait here for up to flush_ms so bursts share a mail
+        batch = config.get("batch", {})
+        self.flush_ms = batch.get("flush_ms", 500)
+        self.max_batch = batch.get("max_batch", 50)
+        self.max_queued = batch.get("max_queued", 1000)
+        # (alert, future) – no future for fire‑and‑forget enqueue()
+        self._outbox: Deque[Tuple[Dict[str, str], asyncio.Future | None]] = deque()
+        self._flusher: asyncio.Task | None = None
+
+        # feed(): ticks queue up in arrival order and one background task
+        # checks them in batches – deferral off the tick path, not
+        # parallelism (check() is plain Python on the event loop)
+        feed = config.get("feed", {})
+        self.feed_batch = feed.get("max_batch", 500)
+        self.feed_max_queued = feed.get("max_queued", 65_536)
+        self.feed_dropped = 0
+        self.on_alerts = on_alerts
+        self._feed_q: asyncio.Queue | None = None
+        self._feed_task: asyncio.Task | None = None
+        self._pending: Set[asyncio.Task] = set()
         self.logger = logging.getLogger(self.__class__.__name__)
 
     # ------------------------------------------------------------------ #
@@ -61,86 +154,223 @@ class AlertEngine:
         Feed a new tick; return list of alert dicts ready for dispatch.
         """
         now = ts or int(time.time() * 1000)
-        key = (exchange, symbol)
+        st = self.states.get((exchange, symbol)) or self._new_state(exchange, symbol)
+        st.ts.append(now)
+        st.px.append(price)
 
-        dq = self.history.setdefault(key, deque())
-        dq.append((now, price))
+        last_px = st.last_price
+        if (
+            last_px
+            and abs(price - last_px) < self._min_pct * last_px
+            and now - st.last_checked < self.recheck_ms
+        ):
+            return []
+        st.last_price = price
+        st.last_checked = now
 
-        # prune anything older than the bigger window
-        oldest = now - max(self.w24, self.w_short)
-        while dq and dq[0][0] < oldest:
-            dq.popleft()
+        head = self._prune(st, now)
+
+        hit24, pct, ref24, hit_s, pct_s, ref_s, st.last24, st.last_short = check_kernel(
+            st.ts, st.px, head, len(st.ts), now, price,
+            self.w24, self.w_short, self.pct_24h, self.pct_short, self.cooldown,
+            st.last24, st.last_short,
+        )
 
         alerts: List[Dict[str, str]] = []
+        if hit24:
+            alerts.append(self._alert_24h(exchange, symbol, price, pct, ref24))
+        if hit_s:
+            alerts.append(self._alert_short(exchange, symbol, price, pct_s, ref_s))
+        return alerts
 
-        # helper for de‑duplication
-        def _should_alert(tag: Tuple[str, str, str]):
-            last = self.last_alert.get(tag, 0)
-            return now - last >= self.cooldown
-
-        # ---- 24 h window ------------------------------------------------ #
-        ref_price_24h = self._price_at_or_before(dq, now - self.w24)
-        if ref_price_24h:
-            pct = (price - ref_price_24h) / ref_price_24h
-            tag = key + ("24h",)
-            if abs(pct) >= self.pct_24h and _should_alert(tag):
-                alerts.append(
-                    {
-                        "subject": f"{symbol} moved {pct:+.2%} over 24 h",
-                        "message": (
-                            f"{exchange}:{symbol} price is {price:.8g}, "
-                            f"{pct:+.2%} versus 24 h ago ({ref_price_24h:.8g})."
-                        ),
-                    }
-                )
-                self.last_alert[tag] = now
-
-        # ---- short window ---------------------------------------------- #
-        ref_price_short = self._price_at_or_before(dq, now - self.w_short)
-        if ref_price_short:
-            pct_s = (price - ref_price_short) / ref_price_short
-            tag = key + ("short",)
-            if abs(pct_s) >= self.pct_short and _should_alert(tag):
-                mins = self.w_short / 1000 / 60
-                alerts.append(
-                    {
-                        "subject": f"{symbol} moved {pct_s:+.2%} in {mins:.0f} min",
-                        "message": (
-                            f"{exchange}:{symbol} price is {price:.8g}, "
-                            f"{pct_s:+.2%} within the last {mins:.0f} minutes "
-                            f"(was {ref_price_short:.8g})."
-                        ),
-                    }
-                )
-                self.last_alert[tag] = now
+    def feed(self, exchange: str, symbol: str, price: float, ts: TS | None) -> None:
+        """
+        Queue a tick for background evaluation; never blocks.
 
-        return alerts
+        One background task drains the queue in batches of up to
+        ``feed.max_batch`` ticks and runs each through :meth:`check`
+        (compiled kernel, with the ``recheck_ms`` early‑out).  Alerts are
+        handed to ``on_alerts(exchange, symbol, alerts)`` in a new task.  A
+        queue already holding ``feed.max_queued`` ticks drops the new one
+        (counted in ``feed_dropped``).  Don't mix with direct :meth:`check`
+        calls for the same pair.
+        """
+        if self._feed_task is None:
+            self._feed_q = asyncio.Queue(self.feed_max_queued)
+            self._feed_task = asyncio.create_task(self._feed_loop(self._feed_q), name="alerts.feed")
+        try:
+            self._feed_q.put_nowait((exchange, symbol, price, ts))
+        except asyncio.QueueFull:
+            self.feed_dropped += 1
+            if self.feed_dropped == 1 or self.feed_dropped % 10_000 == 0:
+                self.logger.warning("Alert feed full – %d tick(s) dropped so far", self.feed_dropped)
+
+    async def send(self, alert: Dict[str, str]) -> bool:
+        """
+        Queue *alert* for e‑mail and wait for its batch to go out.
 
-    async def send(self, alert: Dict[str, str]):
+        Alerts arriving within ``flush_ms`` of each other are fused into one
+        message (see :meth:`EmailSender.send_many`).  Returns True when the
+        e‑mail carrying this alert was accepted by the relay.
         """
-        Fire the given alert email; logs failures for retry.
+        return (await self.send_many([alert]))[0]
+
+    async def send_many(self, alerts: Sequence[Dict[str, str]]) -> List[bool]:
+        """
+        Queue several alerts at once and wait until all have gone out.
+
+        They enter the outbox together, so (up to ``max_batch``) they share
+        one e‑mail.  Returns one success flag per alert, in order.
+        """
+        loop = asyncio.get_running_loop()
+        futs = []
+        for alert in alerts:
+            fut = loop.create_future()
+            self._outbox.append((alert, fut))
+            futs.append(fut)
+        self._start_flusher()
+        return list(await asyncio.gather(*futs))
+
+    def enqueue(self, alert: Dict[str, str]) -> bool:
+        """
+        Queue *alert* for e‑mail without waiting for delivery.
+
+        For callers on the tick path (the monitors): the background flusher
+        mails it with the next batch.  When ``max_queued`` alerts are
+        already waiting the alert is dropped with a warning and False is
+        returned.
+        """
+        if len(self._outbox) >= self.max_queued:
+            self.logger.warning("Alert outbox full – dropping %s", alert["subject"])
+            return False
+        self._outbox.append((alert, None))
+        self._start_flusher()
+        return True
+
+    async def aclose(self, timeout: float = 10.0):
+        """
+        Shutdown: evaluate the ticks still queued for :meth:`feed`, let the
+        ``on_alerts`` callbacks run and mail everything left in the outbox.
+
+        Gives up after *timeout* seconds, logging how many alerts were lost.
+        Call before closing :attr:`email_sender`.
         """
-        ok = await self.email_sender.send(alert["subject"], alert["message"])
-        if not ok:
-            self.logger.error("Email dispatch failed → %s", alert["subject"])
+        ticks = []
+        if self._feed_task is not None:
+            self._feed_task.cancel()
+            await asyncio.gather(self._feed_task, return_exceptions=True)
+            while not self._feed_q.empty():
+                ticks.append(self._feed_q.get_nowait())
+            self._feed_task = self._feed_q = None
+        if ticks and self.on_alerts is not None:
+            for exchange, symbol, alerts in self._check_ticks(ticks):
+                task = asyncio.create_task(self.on_alerts(exchange, symbol, alerts))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+        try:
+            await asyncio.wait_for(self._drain_outbox(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning("Shutdown: %d alert(s) left unsent", len(self._outbox))
+
+    async def _drain_outbox(self):
+        while self._pending or self._outbox or (self._flusher and not self._flusher.done()):
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+            await asyncio.sleep(0)  # callbacks' own tasks queue their alerts
+            if self._flusher is not None and not self._flusher.done():
+                await self._flusher
+            elif self._outbox:
+                self._start_flusher()
+
+    def _start_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_outbox(), name="alerts.flush")
+
+    async def _flush_outbox(self):
+        while self._outbox:
+            await asyncio.sleep(self.flush_ms / 1000)
+            n = min(self.max_batch, len(self._outbox))
+            batch = [self._outbox.popleft() for _ in range(n)]
+            alerts = [a for a, _ in batch]
+            try:
+                ok = await self.email_sender.send_many(alerts)
+            except Exception:  # noqa: BLE001
+                self.logger.exception("Email dispatch crashed")
+                ok = False
+            if not ok:
+                self.logger.error("Email dispatch failed → %s", alerts[0]["subject"])
+            for _, fut in batch:
+                if fut is not None and not fut.done():
+                    fut.set_result(ok)
+
+    async def _feed_loop(self, q: asyncio.Queue):
+        while True:
+            ticks = [await q.get()]
+            while len(ticks) < self.feed_batch and not q.empty():
+                ticks.append(q.get_nowait())
+            try:
+                results = self._check_ticks(ticks)
+            except Exception:  # noqa: BLE001
+                self.logger.exception("Alert check failed for %d ticks", len(ticks))
+                continue
+            if self.on_alerts is None:
+                continue
+            for exchange, symbol, alerts in results:
+                task = asyncio.create_task(self.on_alerts(exchange, symbol, alerts))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    def _check_ticks(self, ticks) -> List[Tuple[str, str, List[Dict[str, str]]]]:
+        """Run :meth:`check` over *ticks* in order; alerts grouped per pair (pairs with alerts only)."""
+        check = self.check
+        by_pair: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+        for exchange, symbol, price, ts in ticks:
+            alerts = check(exchange, symbol, price, ts)
+            if alerts:
+                by_pair.setdefault((exchange, symbol), []).extend(alerts)
+        return [(exchange, symbol, alerts) for (exchange, symbol), alerts in by_pair.items()]
 
     # ------------------------------------------------------------------ #
     # helpers                                                            #
     # ------------------------------------------------------------------ #
-    @staticmethod
-    def _price_at_or_before(
-        dq: Deque[Tuple[TS, PRICE]], cutoff: TS
-    ) -> float | None:
+    def _new_state(self, exchange: str, symbol: str) -> SymbolState:
+        st = self.states[(exchange, symbol)] = SymbolState()
+        return st
+
+    def _prune(self, st: SymbolState, now: TS) -> int:
         """
-        Return the price whose timestamp is the latest that is *≤ cutoff*.
+        Advance the head past samples no window can use any more.
 
-        Uses bisect on a list of timestamps extracted from the deque for O(log n).
+        The latest sample at or before ``now - max(window)`` is kept – it is
+        the reference price for the widest window – unless that would leave
+        more than ``max_history`` live samples.  The dead prefix is dropped
+        in one slice once it dominates the buffer, so memory per pair stays
+        below ~2 × ``max_history`` × 16 bytes.
         """
-        if not dq or dq[0][0] > cutoff:
-            return None
-
-        ts_list = [ts for ts, _ in dq]
-        idx = bisect.bisect_right(ts_list, cutoff) - 1
-        if idx >= 0:
-            return dq[idx][1]
-        return None
+        ts_arr = st.ts
+        head = max(
+            st.head,
+            bisect.bisect_right(ts_arr, now - self._horizon, st.head) - 1,
+            len(ts_arr) - self.max_history,
+        )
+        if head >= _COMPACT_MIN and head * 2 >= len(ts_arr):
+            del ts_arr[:head]
+            del st.px[:head]
+            head = 0
+        st.head = head
+        return head
+
+    def _alert_24h(self, exchange: str, symbol: str, price: float, pct: float, ref: float):
+        return {
+            "subject": _SUBJ_24H(symbol=symbol, pct=pct),
+            "message": _MSG_24H(exchange=exchange, symbol=symbol, price=price, pct=pct, ref=ref),
+        }
+
+    def _alert_short(self, exchange: str, symbol: str, price: float, pct: float, ref: float):
+        return {
+            "subject": self._subj_short(symbol=symbol, pct=pct),
+            "message": self._msg_short(
+                exchange=exchange, symbol=symbol, price=price, pct=pct, ref=ref,
+            ),
+        }
@@ -6,17 +6,32 @@ New in this version
 * merges in sane defaults for the alerts section
 * validates that alert thresholds are numeric
 * raises early, clear exceptions instead of logging‑and‑continuing
+* parsed YAML is cached in‑process per (path, mtime) via ``lru_cache``
+* thresholds are validated by a ``msgspec.Struct`` when msgspec is
+  installed (hand‑written checks otherwise)
 """
 
 from __future__ import annotations
 
+import copy
 import logging
-import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Annotated, Any, Dict
 
 import yaml
 
+try:  # libyaml bindings are several times faster than the pure‑Python loader
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:  # optional: typed validation in C
+    import msgspec
+    from msgspec import Meta
+except ImportError:
+    msgspec = None
+
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -32,16 +47,38 @@ DEFAULT_ALERTS: Dict[str, Any] = {
     "email": {},
 }
 
+if msgspec is not None:
+    class _Thresholds(msgspec.Struct):
+        """Schema for ``alerts.thresholds`` (unknown keys are ignored)."""
+
+        pct_24h: Annotated[float, Meta(gt=0)]
+        window_24h_ms: Annotated[int, Meta(gt=0)]
+        pct_short: Annotated[float, Meta(gt=0)]
+        window_short_ms: Annotated[int, Meta(gt=0)]
+
+
+def _merge(dst: dict, src: dict) -> dict:
+    """Deep‑merge *src* into *dst* in place (src wins); iterative, no copies."""
+    stack = [(dst, src)]
+    while stack:
+        d, s = stack.pop()
+        for k, v in s.items():
+            if isinstance(v, dict) and isinstance(d.get(k), dict):
+                stack.append((d[k], v))
+            else:
+                d[k] = v
+    return dst
 
-def _recursive_merge(base: dict, override: dict) -> dict:
-    """Non‑destructive deep merge (override wins)."""
-    merged = base.copy()
-    for k, v in override.items():
-        if isinstance(v, dict) and isinstance(base.get(k), dict):
-            merged[k] = _recursive_merge(base[k], v)
-        else:
-            merged[k] = v
-    return merged
+
+@lru_cache(maxsize=16)
+def _parse_yaml(path_str: str, mtime_ns: int) -> Any:
+    """
+    Parse the YAML at *path_str*; memoised on its mtime.
+
+    Callers must treat the result as read‑only.
+    """
+    with Path(path_str).open("r", encoding="utf‑8") as fh:
+        return yaml.load(fh, Loader=_Loader)
 
 
 # --------------------------------------------------------------------------- #
@@ -59,8 +96,7 @@ def load_config(path: str | Path) -> dict:
     if not path.is_file():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with path.open("r", encoding="utf‑8") as fh:
-        cfg = yaml.safe_load(fh) or {}
+    cfg = copy.deepcopy(_parse_yaml(str(path.resolve()), path.stat().st_mtime_ns)) or {}
 
     # ───── exchanges section ─────────────────────────────────────────────── #
     if "exchanges" not in cfg or not isinstance(cfg["exchanges"], dict):
@@ -72,10 +108,17 @@ def load_config(path: str | Path) -> dict:
         params.setdefault("reconnect_delay", 5)
 
     # ───── alerts section (merge defaults) ───────────────────────────────── #
-    cfg["alerts"] = _recursive_merge(DEFAULT_ALERTS, cfg.get("alerts", {}))
+    cfg["alerts"] = _merge(copy.deepcopy(DEFAULT_ALERTS), cfg.get("alerts") or {})
 
     # basic sanity check on numeric threshold fields
     th = cfg["alerts"]["thresholds"]
+    if msgspec is not None:
+        try:
+            msgspec.convert(th, _Thresholds)
+        except msgspec.ValidationError as exc:
+            raise ValueError(f"alerts.thresholds: {exc}") from None
+        return cfg
+
     for key in ("pct_24h", "pct_short"):
         if not isinstance(th[key], (int, float)) or th[key] <= 0:
             raise ValueError(f"alerts.thresholds.{key} must be a positive number")
@@ -0,0 +1,18 @@
+"""
+Exchange connectors.
+
+``CONNECTOR_REGISTRY`` maps the exchange name used in the config file to
+its connector class; ``supervisor.main`` looks connectors up here and only
+falls back to importing ``supervisor.connectors.<name>`` for plug‑ins that
+are not registered.
+"""
+from typing import Dict, Type
+
+from supervisor.connectors.base import BaseConnector
+from supervisor.connectors.binance import BinanceConnector
+
+__all__ = ["BaseConnector", "BinanceConnector", "CONNECTOR_REGISTRY"]
+
+CONNECTOR_REGISTRY: Dict[str, Type[BaseConnector]] = {
+    "binance": BinanceConnector,
+}
@@ -13,6 +13,16 @@ New keyword arguments
 * **snapshot_limit** — (int, default ``1000``) depth rows requested
   from the REST snapshot (`/api/v3/depth`).  Binance allows 100, 500 or
   1000.
+* **batch_size** / **max_delay_ms** — (int, defaults ``32`` / ``50``)
+  normalised events are handed to ``message_handler`` as a *list*, once
+  ``batch_size`` have accumulated or ``max_delay_ms`` after the first.
+* **frame_queue** — (int, default ``128``) inbound frames buffered ahead
+  of the handlers.  While this many are waiting, new depth deltas are
+  dropped (counted in ``dropped_frames``); the resulting sequence gap
+  triggers a resync once the backlog drains.  Other frames are never
+  dropped: at twice this backlog the reader stops pulling from the
+  socket, so backpressure reaches the WebSocket again.  Undecodable
+  frames are skipped and counted in ``bad_frames``.
 
 Behavioural changes
 -------------------
@@ -20,45 +30,129 @@ Behavioural changes
   starts.  If the socket closes or the sequence becomes inconsistent, a
   fresh snapshot is pulled and the connector resubscribes automatically.
 * ``_handle_depth`` no longer assumes that the first bid/ask in the
-  delta is best‑bid/ask.  It maintains an in‑memory ``dict[price] →
-  size`` and computes best quotes on the fly.
-
-Everything else (ticker / aggTrade payload schema) remains unchanged, so
-existing processors (FlowAccumulator, SpreadMonitor, etc.) work without
-modification.
+  delta is best‑bid/ask.  It maintains an in‑memory price‑sorted
+  ``SortedDict[price] → size`` per side, so best quotes are an O(1) peek
+  and the top‑N ladder an O(N) walk (plain dicts + ``heapq`` top‑N when
+  ``sortedcontainers`` is not installed).  Prices and sizes are kept as
+  integer multiples of the symbol's tick / lot size (from
+  ``/api/v3/exchangeInfo``, 1e‑8 if unavailable) and converted back to
+  floats only in outgoing events.
+* A sequence gap re‑snapshots only the affected symbol, as a background
+  task, while the other streams keep flowing.  The symbol's deltas are
+  buffered meanwhile and replayed on top of the snapshot (those past its
+  ``lastUpdateId``), so the book picks up exactly where the snapshot
+  ends instead of gapping again.
+* An exception raised while handling a frame is no longer swallowed per
+  frame: it ends the connection and ``start()`` reconnects with backoff.
+* With ``depth_levels=0`` a depth event is only emitted when the best
+  bid or ask actually changed.
+* Events are the slotted dataclasses from :mod:`supervisor.events`
+  (same fields as the former dicts, read as attributes).  Depth ladders
+  are parallel ``bid_prices`` / ``bid_qtys`` (and ``ask_*``) float64
+  arrays; ``bids`` / ``asks`` still return *(price, qty)* lists.
 """
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import logging
 import random
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter, neg
 from typing import Dict, List, Optional, Tuple
 
 import aiohttp
+import numpy as np
 from websockets import connect
 
 from supervisor.connectors.base import BaseConnector
+from supervisor.events import DepthEvent, Event, TickerEvent, TradeEvent
+
+try:  # C JSON codec – several times faster on the small, frequent WS frames
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+try:  # price‑sorted book sides; plain dicts + heapq otherwise
+    from sortedcontainers import SortedDict
+except ImportError:
+    SortedDict = None
 
 __all__ = ["BinanceConnector"]
 
 BINANCE_REST = "https://api.binance.com"
 
+# concurrent REST snapshot requests (depth@1000 is a heavy‑weight endpoint)
+_SNAPSHOT_CONCURRENCY = 4
+# snapshots tried per resync before waiting for the next gap to retry
+_RESYNC_ATTEMPTS = 3
+
+# book key scale when exchangeInfo can't be loaded (Binance quotes ≤ 8 decimals)
+_DEFAULT_SCALE = 10 ** 8
+
+# config stream name → Binance stream suffix (full depth deltas, not
+# 5/10/20, every 100 ms)
+_STREAM_SUFFIX = {"ticker": "ticker", "aggTrade": "aggTrade", "depth": "depth@100ms"}
+
 
 # --------------------------------------------------------------------------- #
 # helpers                                                                     #
 # --------------------------------------------------------------------------- #
 
+@lru_cache(maxsize=256)
 def _norm(symbol: str) -> str:
     """Normalise pair name: ``BTC/USDT`` → ``btcusdt``."""
     return symbol.replace("/", "").lower()
 
 
-def _top_of_book(book_side: Dict[float, float], side: str) -> Optional[Tuple[float, float]]:
-    """Return *(price, qty)* of best bid/ask, or *None* if side is empty."""
+def _new_side(side: str) -> Dict[int, int]:
+    """Empty book side, ordered best‑first (bids descending, asks ascending) if possible."""
+    if SortedDict is None:
+        return {}
+    return SortedDict(neg) if side == "bid" else SortedDict()
+
+
+def _decimals(step: str) -> int:
+    """Decimal places of a Binance filter step: ``"0.01000000"`` → 2."""
+    return len(step.rstrip("0").partition(".")[2])
+
+
+def _parse_levels(rows: List[List[str]], px_scale: int, qty_scale: int) -> List[Tuple[int, int]]:
+    """``[[price, qty], …]`` strings → non‑empty fixed‑point *(price, qty)*, each cell parsed once."""
+    levels = [(round(float(p) * px_scale), round(float(q) * qty_scale)) for p, q in rows]
+    return [lv for lv in levels if lv[1] > 0]
+
+
+def _top_of_book(book_side: Dict[int, int], side: str) -> Optional[Tuple[int, int]]:
+    """Return fixed‑point *(price, qty)* of best bid/ask, or *None* if side is empty."""
     if not book_side:
         return None
-    return (max if side == "bid" else min)(book_side.items(), key=lambda x: x[0])  # type: ignore[arg-type]
+    if SortedDict is not None:
+        return book_side.peekitem(0)
+    price = max(book_side) if side == "bid" else min(book_side)
+    return price, book_side[price]
+
+
+def _top_levels(book_side: Dict[int, int], side: str, k: int) -> List[Tuple[int, int]]:
+    """Best *k* levels of one side, best first."""
+    if SortedDict is not None:
+        return list(islice(book_side.items(), k))
+    pick = heapq.nlargest if side == "bid" else heapq.nsmallest
+    return pick(k, book_side.items(), key=itemgetter(0))
+
+
+def _ladder(levels: List[Tuple[int, int]], px_scale: int, qty_scale: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fixed‑point levels → parallel float64 *(prices, qtys)* arrays."""
+    arr = np.array(levels, dtype=np.float64).reshape(-1, 2)
+    return arr[:, 0] / px_scale, arr[:, 1] / qty_scale
 
 
 # --------------------------------------------------------------------------- #
@@ -79,13 +173,17 @@ class BinanceConnector(BaseConnector):
         *,
         depth_levels: int = 20,
         snapshot_limit: int = 1000,
+        batch_size: int = 32,
+        max_delay_ms: int = 50,
+        frame_queue: int = 128,
     ):
         """Create a connector for one or more *symbols* (e.g. ``BTC/USDT``).
 
         Parameters
         ----------
         message_handler : coroutine
-            Callback receiving the normalised dict per event.
+            Callback receiving a list of normalised events
+            (:mod:`supervisor.events`).
         streams : list[str] | None
             Any of {"ticker", "aggTrade", "depth"}.  Defaults to ["ticker"].
         depth_levels : int
@@ -93,6 +191,12 @@ class BinanceConnector(BaseConnector):
             ``0`` ⇒ send only best‑bid / best‑ask.
         snapshot_limit : int
             Row count for REST snapshot; Binance supports 100 / 500 / 1000.
+        batch_size, max_delay_ms : int
+            Flush buffered events to ``message_handler`` at this many events,
+            or this long after the first one, whichever comes first.
+        frame_queue : int
+            Inbound frame backlog beyond which depth deltas are shed; other
+            frames wait for room once it reaches twice this.
         """
         streams = streams or ["ticker"]
 
@@ -102,18 +206,73 @@ class BinanceConnector(BaseConnector):
         self.base_delay = reconnect_delay
         self.depth_levels = depth_levels
         self.snapshot_limit = snapshot_limit
+        self.batch_size = batch_size
+        self.max_delay_s = max_delay_ms / 1000
+        self.frame_queue = frame_queue
+        self.dropped_frames = 0
+        self.bad_frames = 0
+
+        # raw (btcusdt / BTCUSDT)  -> cfg (BTC/USDT); frames carry the upper‑case
+        # form, so lookups need no .lower() per message
+        self._raw_to_cfg: Dict[str, str] = {}
+        for s in symbols:
+            self._raw_to_cfg[_norm(s)] = s
+            self._raw_to_cfg[_norm(s).upper()] = s
+        # REST snapshot URL per symbol – resyncs fire in bursts after a reconnect
+        self._snapshot_url: Dict[str, str] = {
+            s: f"{BINANCE_REST}/api/v3/depth?symbol={_norm(s).upper()}&limit={snapshot_limit}"
+            for s in symbols
+        }
 
-        # raw (btcusdt)  -> cfg (BTC/USDT)
-        self._raw_to_cfg: Dict[str, str] = {_norm(s): s for s in symbols}
-
-        # per‑symbol order book state
-        self._bids: Dict[str, Dict[float, float]] = {s: {} for s in symbols}
-        self._asks: Dict[str, Dict[float, float]] = {s: {} for s in symbols}
+        # SUBSCRIBE frame never changes → build it once, resend on reconnect
+        self._sub_params = [
+            f"{_norm(sym)}@{suffix}"
+            for sym in symbols
+            for name, suffix in _STREAM_SUFFIX.items()
+            if name in self.streams_cfg
+        ]
+        self._sub_payload = _dumps({"method": "SUBSCRIBE", "params": self._sub_params, "id": 1})
+
+        # per‑symbol order book state, each side sorted best‑first
+        self._bids: Dict[str, Dict[int, int]] = {s: _new_side("bid") for s in symbols}
+        self._asks: Dict[str, Dict[int, int]] = {s: _new_side("ask") for s in symbols}
         self._last_id: Dict[str, int] = {s: 0 for s in symbols}
+        # best quotes, kept current by _apply_delta (None = side empty)
+        self._best_bid: Dict[str, Optional[Tuple[int, int]]] = {s: None for s in symbols}
+        self._best_ask: Dict[str, Optional[Tuple[int, int]]] = {s: None for s in symbols}
+        # book keys are price × px_scale, sizes qty × qty_scale (exact ints)
+        self._px_scale: Dict[str, int] = {s: _DEFAULT_SCALE for s in symbols}
+        self._qty_scale: Dict[str, int] = {s: _DEFAULT_SCALE for s in symbols}
+        self._scales_loaded = False
+        # last emitted (best_bid, best_ask) – used to skip no‑op top‑of‑book events
+        self._last_top: Dict[str, Tuple[Tuple[int, int], Tuple[int, int]]] = {}
+        # symbols whose book is being re‑snapshotted → their resync task,
+        # and the deltas received since the gap (replayed onto the snapshot)
+        self._resyncing: Dict[str, asyncio.Task] = {}
+        self._resync_buf: Dict[str, List[Dict]] = {}
 
         self.logger = logging.getLogger(self.__class__.__name__)
         self._stop_event = asyncio.Event()
         self._ws = None  # type: Optional[connect]
+        # keep‑alive REST session, open for the lifetime of one connection
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._snapshot_sem = asyncio.Semaphore(_SNAPSHOT_CONCURRENCY)
+
+        # outgoing event buffer; the lock keeps batches in arrival order
+        self._buf: List[Event] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # timer‑driven flush in flight, and an error it raised (re‑raised by
+        # the router so it ends the connection like an inline flush would)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_error: Optional[BaseException] = None
+
+        # frame event type → handler (one dict lookup per frame)
+        self._dispatch = {
+            "24hrTicker": self._handle_ticker,
+            "aggTrade": self._handle_trade,
+            "depthUpdate": self._handle_depth,
+        }
 
     # --------------------------------------------------------------------- #
     # life‑cycle                                                            #
@@ -145,111 +304,226 @@ class BinanceConnector(BaseConnector):
     # internal                                                              #
     # --------------------------------------------------------------------- #
     async def _run_once(self):
-        # 1. download snapshots *before* opening the socket
-        await self._download_all_snapshots()
-
-        # 2. open WebSocket connection
-        self.logger.info("Connecting to Binance at %s", self.WS_URL)
-        async with connect(self.WS_URL, max_queue=None) as ws:
-            self._ws = ws
-            await self._subscribe(ws)
-            await self._router(ws)
+        # one pooled session serves the initial snapshots and every resync
+        conn = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=conn) as self._http:
+            try:
+                # 1. download snapshots *before* opening the socket
+                if "depth" in self.streams_cfg and not self._scales_loaded:
+                    await self._load_scales()
+                await self._download_all_snapshots()
+
+                # 2. open WebSocket connection
+                self.logger.info("Connecting to Binance at %s", self.WS_URL)
+                # small JSON frames: inflating each costs more than it saves
+                async with connect(
+                    self.WS_URL,
+                    max_queue=256,
+                    compression=None,
+                    read_limit=2 ** 20,
+                    write_limit=2 ** 20,
+                ) as ws:
+                    self._ws = ws
+                    await self._subscribe(ws)
+                    await self._router(ws)
+            finally:
+                self._http = None
 
     # ------------------------- REST snapshots --------------------------- #
+    async def _load_scales(self):
+        """Read tick / lot sizes once; books keep prices as integer ticks."""
+        symbols = "[" + ",".join(f'"{_norm(s).upper()}"' for s in self.symbols_cfg) + "]"
+        url = f"{BINANCE_REST}/api/v3/exchangeInfo"
+        try:
+            async with self._http.get(url, params={"symbols": symbols}, timeout=10) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"HTTP {resp.status}")
+                info = await resp.json()
+        except Exception as exc:  # noqa: BLE001 – default scale still works
+            self.logger.warning("exchangeInfo unavailable (%s) – using 1e-8 steps", exc)
+            return
+
+        for entry in info.get("symbols", []):
+            cfg_sym = self._raw_to_cfg.get(entry["symbol"])
+            if not cfg_sym:
+                continue
+            for flt in entry.get("filters", []):
+                if flt["filterType"] == "PRICE_FILTER":
+                    self._px_scale[cfg_sym] = 10 ** _decimals(flt["tickSize"])
+                elif flt["filterType"] == "LOT_SIZE":
+                    self._qty_scale[cfg_sym] = 10 ** _decimals(flt["stepSize"])
+        self._scales_loaded = True
+
     async def _download_all_snapshots(self):
-        async with aiohttp.ClientSession() as sess:
-            for cfg_sym in self.symbols_cfg:
-                norm = _norm(cfg_sym)
-                url = f"{BINANCE_REST}/api/v3/depth?symbol={norm.upper()}&limit={self.snapshot_limit}"
-                async with sess.get(url, timeout=10) as resp:
-                    if resp.status != 200:
-                        raise RuntimeError(f"Snapshot error {resp.status} for {cfg_sym}")
-                    snap = await resp.json()
-                self._init_book_from_snapshot(cfg_sym, snap)
-                self.logger.info("Snapshot loaded for %s (lastUpdateId=%s)", cfg_sym, snap["lastUpdateId"])
+        snaps = await asyncio.gather(*(self._fetch_snapshot(s) for s in self.symbols_cfg))
+        for cfg_sym, snap in zip(self.symbols_cfg, snaps):
+            self._init_book_from_snapshot(cfg_sym, snap)
+            self.logger.info("Snapshot loaded for %s (lastUpdateId=%s)", cfg_sym, snap["lastUpdateId"])
+
+    async def _fetch_snapshot(self, cfg_sym: str) -> Dict:
+        url = self._snapshot_url[cfg_sym]
+        async with self._snapshot_sem, self._http.get(url, timeout=10) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"Snapshot error {resp.status} for {cfg_sym}")
+            return await resp.json()
 
     def _init_book_from_snapshot(self, cfg_sym: str, snap: Dict):
-        bids = {float(p): float(q) for p, q in snap["bids"] if float(q) > 0}
-        asks = {float(p): float(q) for p, q in snap["asks"] if float(q) > 0}
+        bids = _new_side("bid")
+        asks = _new_side("ask")
+        px_scale = self._px_scale[cfg_sym]
+        qty_scale = self._qty_scale[cfg_sym]
+        bids.update(_parse_levels(snap["bids"], px_scale, qty_scale))
+        asks.update(_parse_levels(snap["asks"], px_scale, qty_scale))
         self._bids[cfg_sym] = bids
         self._asks[cfg_sym] = asks
+        self._best_bid[cfg_sym] = _top_of_book(bids, "bid")
+        self._best_ask[cfg_sym] = _top_of_book(asks, "ask")
         self._last_id[cfg_sym] = int(snap["lastUpdateId"])
 
     # ------------------------- subscription ---------------------------- #
     async def _subscribe(self, ws):
-        params = []
-        for sym in self.symbols_cfg:
-            norm = _norm(sym)
-            if "ticker" in self.streams_cfg:
-                params.append(f"{norm}@ticker")
-            if "aggTrade" in self.streams_cfg:
-                params.append(f"{norm}@aggTrade")
-            if "depth" in self.streams_cfg:
-                # full depth deltas (not 5/10/20) every 100 ms
-                params.append(f"{norm}@depth@100ms")
-
-        sub_msg = {"method": "SUBSCRIBE", "params": params, "id": 1}
-        await ws.send(json.dumps(sub_msg))
+        await ws.send(self._sub_payload)
         self.logger.info("Subscribed (%s): %s", ", ".join(self.streams_cfg), ", ".join(self.symbols_cfg))
 
     # ------------------------- message router -------------------------- #
     async def _router(self, ws):
-        async for raw in ws:
-            if self._stop_event.is_set():
-                break
-            try:
-                msg = json.loads(raw)
-                ev = msg.get("e")
-                if ev == "24hrTicker":
-                    await self._handle_ticker(msg)
-                elif ev == "aggTrade":
-                    await self._handle_trade(msg)
-                elif ev == "depthUpdate":
-                    await self._handle_depth(msg)
-            except Exception as exc:  # noqa: BLE001
-                self.logger.debug("Bad Binance payload: %s (%s)", raw, exc)
-        self._ws = None  # drop ref so start() can reconnect
+        frames: asyncio.Queue = asyncio.Queue(2 * self.frame_queue)
+        reader = asyncio.create_task(self._read_frames(ws, frames))
+        self._flush_error = None
+        # one try per connection: a handler error ends it and start() reconnects
+        try:
+            while True:
+                raw = await frames.get()
+                if raw is None or self._stop_event.is_set():
+                    break
+                await self._process_frame(raw)
+                self._raise_flush_error()
+            await self._flush()
+            self._raise_flush_error()
+        finally:
+            if self._flush_task is not None and not self._flush_task.done():
+                self._flush_task.cancel()
+            for task in self._resyncing.values():  # the REST session closes with us
+                task.cancel()
+            self._ws = None  # drop ref so start() can reconnect
+            if not reader.done():
+                reader.cancel()
+        if reader.done():
+            reader.result()  # re‑raise a socket error so start() backs off
+
+    async def _process_frame(self, raw):
+        try:
+            msg = _loads(raw)
+        except ValueError:  # orjson / json decode errors both subclass it
+            self.bad_frames += 1
+            self.logger.debug("Undecodable Binance frame: %s", raw)
+            return
+        handler = self._dispatch.get(msg.get("e"))
+        if handler is not None:
+            await handler(msg)
+
+    async def _read_frames(self, ws, frames: asyncio.Queue):
+        """
+        Socket → *frames*; sheds depth deltas while the handlers lag behind
+        and blocks on a full queue otherwise (no reads → socket backpressure).
+        """
+        shedding = False
+        cancelled = False
+        try:
+            async for raw in ws:
+                if frames.qsize() >= self.frame_queue and "depthUpdate" in raw:
+                    if not shedding:
+                        self.logger.warning("Handlers lagging – dropping depth frames")
+                        shedding = True
+                    self.dropped_frames += 1
+                    continue
+                if shedding and frames.qsize() < self.frame_queue:
+                    self.logger.info("Backlog drained (%d depth frames dropped so far)", self.dropped_frames)
+                    shedding = False
+                await frames.put(raw)
+        except asyncio.CancelledError:
+            cancelled = True  # the router is gone – nobody waits for the end marker
+            raise
+        finally:
+            if not cancelled:
+                await frames.put(None)
+
+    # ------------------------- event batching -------------------------- #
+    async def _emit(self, out: Event):
+        self._buf.append(out)
+        if len(self._buf) >= self.batch_size:
+            await self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.max_delay_s, self._on_flush_timer
+            )
+
+    def _on_flush_timer(self):
+        self._flush_timer = None
+        self._flush_task = asyncio.create_task(self._flush(), name="binance.flush")
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    def _raise_flush_error(self):
+        if self._flush_error is not None:
+            exc, self._flush_error = self._flush_error, None
+            raise exc
+
+    def _on_flush_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is None:
+            return
+        self.logger.error("Timed flush failed – ending connection: %r", task.exception())
+        self._flush_error = task.exception()
+
+    async def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        async with self._flush_lock:
+            if not self._buf:
+                return
+            batch, self._buf = self._buf, []
+            await self.message_handler(batch)
 
     # -------------------- individual handlers ------------------------- #
     async def _handle_ticker(self, msg):
-        cfg_sym = self._raw_to_cfg.get(msg.get("s", "").lower())
+        cfg_sym = self._raw_to_cfg.get(msg.get("s", ""))
         if not cfg_sym:
             return
 
-        out = {
-            "event": "ticker",
-            "exchange": "binance",
-            "symbol": cfg_sym,
-            "price": float(msg["c"]),
-            "timestamp": int(msg["E"]),
-            "volume": float(msg["v"]),
-            "quote_volume": float(msg["q"]),
-            "best_bid": float(msg["b"]),
-            "best_ask": float(msg["a"]),
-        }
-        await self.message_handler(out)
+        await self._emit(TickerEvent(
+            "binance",
+            cfg_sym,
+            price=float(msg["c"]),
+            timestamp=int(msg["E"]),
+            volume=float(msg["v"]),
+            quote_volume=float(msg["q"]),
+            best_bid=float(msg["b"]),
+            best_ask=float(msg["a"]),
+        ))
 
     async def _handle_trade(self, msg):
-        cfg_sym = self._raw_to_cfg.get(msg.get("s", "").lower())
+        cfg_sym = self._raw_to_cfg.get(msg.get("s", ""))
         if not cfg_sym:
             return
 
-        out = {
-            "event": "trade",
-            "exchange": "binance",
-            "symbol": cfg_sym,
-            "price": float(msg["p"]),
-            "qty": float(msg["q"]),
-            "side": "sell" if msg["m"] else "buy",  # maker was seller?
-            "timestamp": int(msg["E"]),
-        }
-        await self.message_handler(out)
+        await self._emit(TradeEvent(
+            "binance",
+            cfg_sym,
+            price=float(msg["p"]),
+            qty=float(msg["q"]),
+            side="sell" if msg["m"] else "buy",  # maker was seller?
+            timestamp=int(msg["E"]),
+        ))
 
     # -------------------------- depth --------------------------------- #
     async def _handle_depth(self, msg):
-        cfg_sym = self._raw_to_cfg.get(msg.get("s", "").lower())
+        cfg_sym = self._raw_to_cfg.get(msg.get("s", ""))
         if not cfg_sym:
             return
+        pending = self._resync_buf.get(cfg_sym)
+        if pending is not None:  # book rebuilding → keep for the replay
+            pending.append(msg)
+            return
 
         first_id: int = msg["U"]  # start of update id range
         last_id: int = msg["u"]   # end of range (inclusive)
@@ -259,62 +533,129 @@ class BinanceConnector(BaseConnector):
         if last_id <= cur_last:
             return
 
-        # 2. gap check — if missing packets → resync
+        # 2. gap check — if missing packets → resync in the background so the
+        #    router keeps serving the other symbols meanwhile
         if not (first_id <= cur_last + 1 <= last_id):
             self.logger.warning("Seq gap for %s (have %d, got %d-%d) — resync", cfg_sym, cur_last, first_id, last_id)
-            await self._resync_symbol(cfg_sym)
+            self._resync_buf[cfg_sym] = [msg]
+            self._resyncing[cfg_sym] = asyncio.create_task(self._resync_symbol(cfg_sym))
             return
 
         # 3. apply delta to local book
         self._apply_delta(cfg_sym, msg)
         self._last_id[cfg_sym] = last_id
 
-        bids = self._bids[cfg_sym]
-        asks = self._asks[cfg_sym]
-        best_bid = _top_of_book(bids, "bid")
-        best_ask = _top_of_book(asks, "ask")
+        top_bid = self._best_bid[cfg_sym]
+        top_ask = self._best_ask[cfg_sym]
 
-        if not (best_bid and best_ask):  # incomplete book → ignore
+        if not (top_bid and top_ask):  # incomplete book → ignore
             return
-
+        if not self.depth_levels:
+            # nothing but the top is emitted → skip if it didn't move
+            top = (top_bid, top_ask)
+            if self._last_top.get(cfg_sym) == top:
+                return
+            self._last_top[cfg_sym] = top
+
+        # fixed point → float (int / int is correctly rounded, so these equal
+        # float() of the original decimal strings)
+        px_scale = self._px_scale[cfg_sym]
+        qty_scale = self._qty_scale[cfg_sym]
+        best_bid = (top_bid[0] / px_scale, top_bid[1] / qty_scale)
+        best_ask = (top_ask[0] / px_scale, top_ask[1] / qty_scale)
         mid_price = (best_bid[0] + best_ask[0]) / 2.0
 
-        out = {
-            "event": "depth",
-            "exchange": "binance",
-            "symbol": cfg_sym,
-            "timestamp": int(msg["E"]),
-            "best_bid": best_bid,
-            "best_ask": best_ask,
-            "price": mid_price,  # compatibility shim
-        }
+        out = DepthEvent(
+            "binance",
+            cfg_sym,
+            timestamp=int(msg["E"]),
+            best_bid=best_bid,
+            best_ask=best_ask,
+            price=mid_price,  # compatibility shim
+        )
         if self.depth_levels:
-            # sort depths and cut to requested levels
-            out["bids"] = sorted(bids.items(), key=lambda x: -x[0])[: self.depth_levels]
-            out["asks"] = sorted(asks.items(), key=lambda x: x[0])[: self.depth_levels]
-        await self.message_handler(out)
+            # sides are already sorted best‑first → just take the top levels
+            out.bid_prices, out.bid_qtys = _ladder(
+                _top_levels(self._bids[cfg_sym], "bid", self.depth_levels), px_scale, qty_scale)
+            out.ask_prices, out.ask_qtys = _ladder(
+                _top_levels(self._asks[cfg_sym], "ask", self.depth_levels), px_scale, qty_scale)
+        await self._emit(out)
 
     def _apply_delta(self, cfg_sym: str, msg: Dict):
+        """
+        Apply one depth delta and keep the cached best quotes current.
+
+        A level at or through the best replaces it directly; only when the
+        best level itself is removed is the side re‑peeked afterwards.
+        """
         bids = self._bids[cfg_sym]
         asks = self._asks[cfg_sym]
+        best_bid = self._best_bid[cfg_sym]
+        best_ask = self._best_ask[cfg_sym]
+        px_scale = self._px_scale[cfg_sym]
+        qty_scale = self._qty_scale[cfg_sym]
         for p_str, q_str in msg.get("b", []):
-            price, qty = float(p_str), float(q_str)
+            price, qty = round(float(p_str) * px_scale), round(float(q_str) * qty_scale)
             if qty == 0:
                 bids.pop(price, None)
+                if best_bid is not None and price == best_bid[0]:
+                    best_bid = None  # best level gone → re‑peek below
             else:
                 bids[price] = qty
+                if best_bid is not None and price >= best_bid[0]:
+                    best_bid = (price, qty)
         for p_str, q_str in msg.get("a", []):
-            price, qty = float(p_str), float(q_str)
+            price, qty = round(float(p_str) * px_scale), round(float(q_str) * qty_scale)
             if qty == 0:
                 asks.pop(price, None)
+                if best_ask is not None and price == best_ask[0]:
+                    best_ask = None
             else:
                 asks[price] = qty
+                if best_ask is not None and price <= best_ask[0]:
+                    best_ask = (price, qty)
+        self._best_bid[cfg_sym] = best_bid if best_bid is not None else _top_of_book(bids, "bid")
+        self._best_ask[cfg_sym] = best_ask if best_ask is not None else _top_of_book(asks, "ask")
 
     async def _resync_symbol(self, cfg_sym: str):
+        """
+        Reload *cfg_sym*'s book from a REST snapshot and replay the deltas
+        buffered since the gap on top of it.  A snapshot older than the
+        buffered stream is fetched again (up to ``_RESYNC_ATTEMPTS``).
+        """
         self.logger.info("Resyncing order book for %s", cfg_sym)
-        async with aiohttp.ClientSession() as sess:
-            norm = _norm(cfg_sym)
-            url = f"{BINANCE_REST}/api/v3/depth?symbol={norm.upper()}&limit={self.snapshot_limit}"
-            async with sess.get(url, timeout=10) as resp:
-                snap = await resp.json()
-        self._init_book_from_snapshot(cfg_sym, snap)
+        try:
+            for _ in range(_RESYNC_ATTEMPTS):
+                snap = await self._fetch_snapshot(cfg_sym)
+                self._init_book_from_snapshot(cfg_sym, snap)
+                if self._replay_buffered(cfg_sym):
+                    return
+                self.logger.info("Snapshot for %s predates the buffered deltas – refetching", cfg_sym)
+            self.logger.warning("Resync for %s gave up after %d snapshots", cfg_sym, _RESYNC_ATTEMPTS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 – next gap retries
+            self.logger.warning("Resync failed for %s: %s", cfg_sym, exc)
+        finally:
+            self._resyncing.pop(cfg_sym, None)
+            self._resync_buf.pop(cfg_sym, None)
+
+    def _replay_buffered(self, cfg_sym: str) -> bool:
+        """
+        Apply the buffered deltas newer than the freshly loaded snapshot.
+
+        Follows Binance's recipe: skip ``u <= lastUpdateId``; the first
+        one applied must satisfy ``U <= lastUpdateId + 1 <= u`` and each
+        later one must continue the sequence.  Returns False (book left at
+        the snapshot) when that fails, i.e. another snapshot is needed.
+        """
+        last = self._last_id[cfg_sym]
+        for msg in self._resync_buf[cfg_sym]:
+            if msg["u"] <= last:
+                continue
+            if not (msg["U"] <= last + 1 <= msg["u"]):
+                return False
+            self._apply_delta(cfg_sym, msg)
+            last = msg["u"]
+        self._last_id[cfg_sym] = last
+        return True
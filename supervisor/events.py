@@ -0,0 +1,98 @@
+"""
+Normalised market events – what connectors hand to ``TickHandler``.
+
+Slotted dataclasses rather than dicts: no per‑instance ``__dict__`` and
+attribute reads skip string hashing.  ``event`` is a class constant, so it
+costs nothing per instance; :func:`as_row` turns an event back into the
+flat dict layout written by ``FileSink`` (same keys, same order as the
+dicts these classes replace).
+
+Depth ladders travel as parallel float64 arrays (``bid_prices`` /
+``bid_qtys`` …) rather than lists of *(price, qty)* tuples; ``bids`` /
+``asks`` rebuild the tuple form on demand for :func:`as_row` and older
+callers (``FileSink`` buffers the arrays themselves).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import ClassVar, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+__all__ = ["TickerEvent", "TradeEvent", "DepthEvent", "Event", "as_row"]
+
+Level = Tuple[float, float]  # (price, qty)
+
+
+@dataclass(slots=True)
+class TickerEvent:
+    event: ClassVar[str] = "ticker"
+
+    exchange: str
+    symbol: str
+    price: float
+    timestamp: int
+    volume: float
+    quote_volume: float
+    best_bid: float
+    best_ask: float
+
+
+@dataclass(slots=True)
+class TradeEvent:
+    event: ClassVar[str] = "trade"
+
+    exchange: str
+    symbol: str
+    price: float
+    qty: float
+    side: str  # "buy" / "sell" (aggressor)
+    timestamp: int
+
+
+@dataclass(slots=True)
+class DepthEvent:
+    event: ClassVar[str] = "depth"
+
+    exchange: str
+    symbol: str
+    timestamp: int
+    best_bid: Level
+    best_ask: Level
+    price: float  # mid – compatibility shim
+    # top levels, best first (if requested)
+    bid_prices: Optional[np.ndarray] = None
+    bid_qtys: Optional[np.ndarray] = None
+    ask_prices: Optional[np.ndarray] = None
+    ask_qtys: Optional[np.ndarray] = None
+
+    @property
+    def bids(self) -> Optional[List[Level]]:
+        if self.bid_prices is None:
+            return None
+        return list(zip(self.bid_prices.tolist(), self.bid_qtys.tolist()))
+
+    @property
+    def asks(self) -> Optional[List[Level]]:
+        if self.ask_prices is None:
+            return None
+        return list(zip(self.ask_prices.tolist(), self.ask_qtys.tolist()))
+
+
+Event = Union[TickerEvent, TradeEvent, DepthEvent]
+
+# row columns per class, resolved once (depth rows keep the tuple ladders)
+_FIELDS: Dict[type, Tuple[str, ...]] = {
+    cls: tuple(f.name for f in fields(cls)) for cls in (TickerEvent, TradeEvent)
+}
+_FIELDS[DepthEvent] = ("exchange", "symbol", "timestamp", "best_bid", "best_ask", "price", "bids", "asks")
+
+
+def as_row(ev: Event) -> Dict:
+    """Flat dict for storage: ``event`` first, then the fields; unset ladders omitted."""
+    row = {"event": ev.event}
+    for name in _FIELDS[type(ev)]:
+        val = getattr(ev, name)
+        if val is not None:
+            row[name] = val
+    return row
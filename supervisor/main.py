@@ -5,8 +5,10 @@ Changes vs. original
 --------------------
 * uses `asyncio.run()` instead of manual loop plumbing
 * pluggable log‑level via --log‑level
-* safer dynamic import with importlib + snake→Camel helper
+* connectors resolved from ``CONNECTOR_REGISTRY``; importlib + snake→Camel
+  helper only for unregistered plug‑ins
 * graceful shutdown that closes websockets & cancels tasks
+* runs on uvloop when it is installed
 """
 
 from __future__ import annotations
@@ -17,18 +19,26 @@ import contextlib
 import importlib
 import logging
 import signal
+from functools import lru_cache
 from typing import List, Type
 
 from supervisor.config import load_config
+from supervisor.connectors import CONNECTOR_REGISTRY
 from supervisor.processors.handler import TickHandler
 from supervisor.processors.file_sink import FileSink
 
+try:  # libuv‑based event loop; stdlib asyncio loop otherwise (e.g. Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
 logger = logging.getLogger("supervisor.main")
 
 
 # --------------------------------------------------------------------------- #
 # helpers                                                                     #
 # --------------------------------------------------------------------------- #
+@lru_cache(maxsize=None)
 def snake_to_camel(name: str) -> str:
     """binance → Binance, coinbase_pro → CoinbasePro, etc."""
     return "".join(part.capitalize() for part in name.split("_"))
@@ -36,11 +46,18 @@ def snake_to_camel(name: str) -> str:
 
 def import_connector(exchange_name: str) -> Type:
     """
-    Dynamically import a connector module and return its connector class.
+    Return the connector class for *exchange_name*.
+
+    Registered connectors come straight from `CONNECTOR_REGISTRY`.  Anything
+    else is imported from `supervisor.connectors.<name>`:
 
     1. If the module exposes `CONNECTOR_CLASS`, use that.
     2. Otherwise fall back to `<CamelCase>Connector`.
     """
+    cls = CONNECTOR_REGISTRY.get(exchange_name)
+    if cls is not None:
+        return cls
+
     module_path = f"supervisor.connectors.{exchange_name}"
     mod = importlib.import_module(module_path)
 
@@ -128,9 +145,15 @@ async def run_service(args):
     flush_task.cancel()
     await asyncio.gather(*tasks, flush_task, return_exceptions=True)
 
-    # final hard‑flush for whatever remains in RAM
-    for key in list(handler.file_sink.buffers):
-        await handler.file_sink._flush(key)
+    # mail what is still queued, then say goodbye to the SMTP relay if a
+    # connection is still cached (first, so it never waits on the disk)
+    await handler.drain_alerts()
+    await asyncio.to_thread(handler.alert_engine.email_sender.close)
+
+    # final hard‑flush for whatever remains queued or in RAM
+    await handler.drain_sink()
+    await handler.file_sink.flush_all()
+    handler.file_sink.close()
 
     logger.info("Crypto Supervisor stopped.")
 
@@ -166,8 +189,9 @@ def setup_logging(level: str):
 def main():
     args = parse_args()
     setup_logging(args.log_level)
+    run = uvloop.run if uvloop is not None else asyncio.run
     try:
-        asyncio.run(run_service(args))
+        run(run_service(args))
     except KeyboardInterrupt:
         # already handled by signal handler on Unix; this is for Windows
         pass
@@ -29,11 +29,32 @@ BTC_USDT/trade/2025/04/21/trade_2025‑04‑21_11‑05.parquet
 
 Implementation notes
 --------------------
-* **Thread‑safe / async‑safe**: uses asyncio.Lock per bucket.
+* **Thread‑safe / async‑safe**: full or expired buckets are only marked
+  pending; a single drainer holding the flush lock writes every pending
+  bucket back‑to‑back (flat combining), so ``add`` never waits on disk.
+  ``add_many`` takes a whole batch (the handler's sink queue) in one loop.
+* File writes (Parquet encoding + compression, CSV formatting) run on a
+  thread pool; one drain writes its buckets in parallel while the event
+  loop keeps serving ticks.  Call :meth:`close` on shutdown.  Parquet is
+  encoded into memory first and reaches the file in a single ``write``.
 * **Flush conditions**: 1) interval crossed; or 2) buffered rows >=
   *max_rows*.
-* **Parquet** uses Zstandard compression; CSV uses UTF‑8.
+* **Parquet** uses Zstandard compression; CSV uses UTF‑8.  A CSV file's
+  columns are fixed by its header (remembered per file, read back from
+  disk after a restart – no ``exists()`` stat per flush) and rows go through a plain ``csv.writer`` into a
+  1 MiB write buffer.
 * Relies on *pyarrow* when writing Parquet.
+* **Columnar buffers**: each bucket keeps one column per field –
+  ``array('d')`` / ``array('q')`` for numbers, plain lists otherwise –
+  keyed by ``(symbol, event, bucket_id)`` with an integer bucket id, so
+  ``add`` formats no strings and a Parquet flush wraps the numeric
+  buffers without a per‑row walk.  Depth ladders are buffered as the
+  event's price / qty arrays and stacked into the ``bids`` / ``asks``
+  list column in numpy (CSV builds its tuple cells on the writer thread).
+* **Buffer pool**: written buckets go back to a small per‑event free list.
+  Numeric columns keep their grown storage and are overwritten in place
+  (emptying an ``array`` would free it), so a long‑running sink stops
+  reallocating them once warm.
 
 Feel free to extend with S3 upload, auto‑gzip, etc.
 """
@@ -42,13 +63,22 @@ from __future__ import annotations
 import asyncio
 import os
 import csv
-from collections import defaultdict
-from datetime import datetime, timezone, timedelta
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from itertools import islice, repeat
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import logging
 
+import numpy as np
+
+from supervisor.events import Event
+
 try:
     import pyarrow as pa
     import pyarrow.parquet as pq
@@ -61,11 +91,74 @@ logger = logging.getLogger(__name__)
 __all__ = ["FileSink"]
 
 
-def _bucket_start(ts_ms: int, rotate_minutes: int) -> datetime:
-    """Return the UTC datetime floor‑bucket for *ts_ms*."""
-    minutes = (ts_ms // 60000)  # integer minutes since epoch
-    bucket = minutes - (minutes % rotate_minutes)
-    return datetime.fromtimestamp(bucket * 60, tz=timezone.utc)
+# columns buffered per event type, in file order after "event"; a typecode
+# means a packed numeric array, None a plain list (strings, tuples, ndarrays)
+_SCHEMA: Dict[str, Tuple[Tuple[str, Optional[str]], ...]] = {
+    "ticker": (("exchange", None), ("symbol", None), ("price", "d"), ("timestamp", "q"),
+               ("volume", "d"), ("quote_volume", "d"), ("best_bid", "d"), ("best_ask", "d")),
+    "trade":  (("exchange", None), ("symbol", None), ("price", "d"), ("qty", "d"),
+               ("side", None), ("timestamp", "q")),
+    "depth":  (("exchange", None), ("symbol", None), ("timestamp", "q"), ("best_bid", None),
+               ("best_ask", None), ("price", "d"), ("bid_prices", None), ("bid_qtys", None),
+               ("ask_prices", None), ("ask_qtys", None)),
+}
+# depth ladders are buffered as the event's price / qty arrays and written
+# as one column of [price, qty] levels: price column -> (file column, qty column)
+_LADDERS = {"bid_prices": ("bids", "bid_qtys"), "ask_prices": ("asks", "ask_qtys")}
+_LADDER_QTYS = {qty for _, qty in _LADDERS.values()}
+_NUM_NAMES = {ev: tuple(name for name, code in cols if code) for ev, cols in _SCHEMA.items()}
+_OBJ_NAMES = {ev: tuple(name for name, code in cols if not code) for ev, cols in _SCHEMA.items()}
+_NUM_GET = {ev: attrgetter(*names) for ev, names in _NUM_NAMES.items()}
+_OBJ_GET = {ev: attrgetter(*names) for ev, names in _OBJ_NAMES.items()}
+_NP_TYPES = {"d": np.float64, "q": np.int64}
+
+if pa is not None:
+    # explicit Arrow type per column – nothing is inferred from the values
+    _LEVEL = pa.list_(pa.float64())  # (price, qty)
+    _NUM_ARROW = {"d": pa.float64(), "q": pa.int64()}
+    _OBJ_ARROW = {
+        "exchange": pa.string(), "symbol": pa.string(), "side": pa.string(),
+        "best_bid": _LEVEL, "best_ask": _LEVEL,
+        "bids": pa.list_(_LEVEL), "asks": pa.list_(_LEVEL),
+    }
+    _ARROW_SCHEMA: Dict[str, "pa.Schema"] = {
+        ev: pa.schema([("event", pa.string())] + [
+            (name, _NUM_ARROW[code] if code else _OBJ_ARROW[name])
+            for name, code in ((_LADDERS.get(n, (n,))[0], c) for n, c in cols if n not in _LADDER_QTYS)
+        ])
+        for ev, cols in _SCHEMA.items()
+    }
+
+# pooled buffers kept per event type
+_POOL_CAP = 64
+
+BucketKey = Tuple[str, str, int]  # (symbol, event, bucket_id)
+
+
+class _Bucket:
+    """Column buffers of one bucket; only the first *n* numeric slots are live."""
+
+    __slots__ = ("ev", "nums", "objs", "n")
+
+    def __init__(self, ev: str):
+        self.ev = ev
+        self.nums: List[array] = [array(code) for _, code in _SCHEMA[ev] if code]
+        self.objs: List[list] = [[] for _, code in _SCHEMA[ev] if not code]
+        self.n = 0
+
+    def columns(self) -> Dict[str, Union[array, list]]:
+        """Name → column in file order (numeric arrays may run past *n*)."""
+        cols = dict(zip(_NUM_NAMES[self.ev], self.nums))
+        cols.update(zip(_OBJ_NAMES[self.ev], self.objs))
+        return {name: cols[name] for name, _ in _SCHEMA[self.ev]}
+
+
+@lru_cache(maxsize=4096)
+def _shard_path(base_dir: Path, sym: str, ev: str, bucket_id: int, bucket_ms: int, suffix: str) -> Path:
+    """Output file of one bucket (pure – formatted once per bucket, not per flush)."""
+    dt = datetime.fromtimestamp(bucket_id * bucket_ms / 1000, tz=timezone.utc)
+    out_dir = base_dir / sym.replace("/", "_") / ev / dt.strftime("%Y/%m/%d")
+    return out_dir / f"{ev}_{dt:%Y-%m-%d_%H-%M}.{suffix}"
 
 
 class FileSink:
@@ -89,74 +182,250 @@ class FileSink:
         self.max_rows = max_rows
         self.compression = compression
 
-        # bucket_key -> list[dict]
-        self.buffers: Dict[str, List[dict]] = defaultdict(list)
-        # bucket_key -> asyncio.Lock
-        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._bucket_ms = rotate_minutes * 60_000
+        # day folders already created by this sink (skips the mkdir syscalls)
+        self._made_dirs: Set[Path] = set()
+        # CSV file -> column order frozen by its header
+        self._csv_fields: Dict[Path, List[str]] = {}
+
+        # (symbol, event, bucket_id) -> column buffers
+        self.buffers: Dict[BucketKey, _Bucket] = {}
+        # event -> written buffers ready for reuse
+        self._buf_pool: Dict[str, List[_Bucket]] = {ev: [] for ev in _SCHEMA}
+        # buckets waiting to be written; drained under one lock by one task
+        self._pending: Set[BucketKey] = set()
+        self._flush_lock = asyncio.Lock()
+        self._drainer: Optional[asyncio.Task] = None
+        # pyarrow releases the GIL while encoding, so writes truly overlap
+        self._io_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                           thread_name_prefix="file_sink")
 
     # ------------------------------------------------------------------ #
-    async def add(self, tick: Dict):
-        """Add a *normalised* tick/event dict coming from TickHandler."""
-        ts = int(tick.get("timestamp") or 0)
-        if ts == 0:
+    async def add(self, tick: Event):
+        """Add a *normalised* event coming from TickHandler."""
+        self._append(tick)
+
+    async def add_many(self, ticks: List[Event]):
+        """Add a batch of events in one pass (no awaits between rows)."""
+        append = self._append
+        for tick in ticks:
+            append(tick)
+
+    def _append(self, tick: Event):
+        ev = tick.event
+        ts = tick.timestamp
+        if not ts:
             logger.debug("tick without timestamp skipped")
             return
-        sym = tick["symbol"].replace("/", "_")
-        ev = tick["event"]
+        key = (tick.symbol, ev, ts // self._bucket_ms)
 
-        bucket_dt = _bucket_start(ts, self.rotate)  # floored datetime
-        bucket_label = bucket_dt.strftime("%Y-%m-%d_%H-%M")
-        key = f"{sym}|{ev}|{bucket_label}"
+        buf = self.buffers.get(key)
+        if buf is None:
+            pool = self._buf_pool[ev]
+            buf = self.buffers[key] = pool.pop() if pool else _Bucket(ev)
+        n = buf.n
+        if n < len(buf.nums[0]):  # reused storage → overwrite in place
+            for col, val in zip(buf.nums, _NUM_GET[ev](tick)):
+                col[n] = val
+        else:
+            for col, val in zip(buf.nums, _NUM_GET[ev](tick)):
+                col.append(val)
+        for col, val in zip(buf.objs, _OBJ_GET[ev](tick)):
+            col.append(val)
+        buf.n = n + 1
 
-        buf = self.buffers[key]
-        buf.append(tick)
+        if buf.n >= self.max_rows and key not in self._pending:
+            self._pending.add(key)
+            if self._drainer is None or self._drainer.done():
+                self._drainer = asyncio.create_task(self._drain())
 
-        if len(buf) >= self.max_rows:
-            async with self._locks[key]:
-                await self._flush(key)
+    async def _drain(self):
+        """Write every pending bucket; whoever holds the lock does them all."""
+        async with self._flush_lock:
+            failed: List[BucketKey] = []
+            while self._pending:
+                keys = list(self._pending)
+                self._pending.clear()
+                results = await asyncio.gather(*map(self._flush, keys), return_exceptions=True)
+                for key, res in zip(keys, results):
+                    if isinstance(res, Exception):
+                        logger.error("Flush of %s failed: %s", key, res)
+                        failed.append(key)
+            # their rows went back into self.buffers – retry on the next drain
+            self._pending.update(failed)
 
     # ------------------------------------------------------------------ #
-    async def _flush(self, key: str):
+    async def _flush(self, key: BucketKey):
         """Write buffer *key* to disk and clear it."""
-        rows = self.buffers.get(key)
-        if not rows:
+        buf = self.buffers.pop(key, None)  # later adds start a fresh buffer
+        if buf is None or not buf.n:
             return
+        try:
+            await self._write(key, buf)
+        except BaseException:
+            self._restore(key, buf)
+            raise
+        self._release(buf)
+
+    async def _write(self, key: BucketKey, buf: _Bucket):
+        """Encode the live rows of *buf* and write them to the shard of *key*."""
+        n = buf.n
+        # all‑None columns (ladders not requested) are left out of the file
+        cols = {name: col for name, col in buf.columns().items()
+                if not isinstance(col, list) or any(v is not None for v in col)}
+        for px_name, (name, qty_name) in _LADDERS.items():
+            if px_name in cols:
+                cols[name] = (cols.pop(px_name), cols.pop(qty_name))
 
-        sym, ev, label = key.split("|")
-        dt = datetime.strptime(label, "%Y-%m-%d_%H-%M")
-        out_dir = self.base_dir / sym / ev / dt.strftime("%Y/%m/%d")
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_file = out_dir / f"{ev}_{label}.{ 'parquet' if self.fmt=='parquet' else 'csv' }"
+        sym, ev, bucket_id = key
+        out_file = _shard_path(self.base_dir, sym, ev, bucket_id, self._bucket_ms, self.fmt)
+        if out_file.parent not in self._made_dirs:
+            out_file.parent.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(out_file.parent)
 
         if self.fmt == "parquet":
             if pa is None:
                 raise RuntimeError("pyarrow not installed – cannot write Parquet")
-            table = pa.Table.from_pylist(rows)
-            pq.write_table(table, out_file, compression=self.compression)
+            schema = _ARROW_SCHEMA[ev]
+            data = {"event": pa.repeat(ev, n)}
+            for name, col in cols.items():
+                # packed arrays → numpy view → Arrow, no per‑value boxing;
+                # lists are converted straight to their declared type
+                if isinstance(col, array):
+                    data[name] = pa.array(np.frombuffer(col, dtype=_NP_TYPES[col.typecode], count=n))
+                elif isinstance(col, tuple):  # ladder: stacked straight from the arrays
+                    data[name] = _ladder_array(*col)
+                else:
+                    data[name] = pa.array(col, type=schema.field(name).type)
+            table = pa.Table.from_arrays(list(data.values()),
+                                         schema=pa.schema([schema.field(k) for k in data]))
+            write = partial(_write_parquet, table, out_file, self.compression)
         else:  # CSV
-            fieldnames = sorted({k for r in rows for k in r.keys()})
-            write_header = not out_file.exists()
-            with open(out_file, "a", newline="", encoding="utf-8") as fh:
-                w = csv.DictWriter(fh, fieldnames=fieldnames)
-                if write_header:
-                    w.writeheader()
-                w.writerows(rows)
+            cols["event"] = repeat(ev)
+            for name, _ in _LADDERS.values():
+                if name in cols:  # tuples are built by the writer thread
+                    cols[name] = map(_levels, *cols[name])
+            write = partial(_write_csv, out_file, self._csv_fields.get(out_file), cols, n)
 
-        logger.debug("Flushed %d rows → %s", len(rows), out_file)
-        self.buffers.pop(key, None)
+        written = await asyncio.get_running_loop().run_in_executor(self._io_pool, write)
+        if self.fmt == "csv":
+            self._csv_fields[out_file] = written
+        logger.debug("Flushed %d rows → %s", n, out_file)
+        # drop the Arrow / numpy views of the arrays before they are reused
+        del write, cols
+        if self.fmt == "parquet":
+            del table, data
+
+    def _restore(self, key: BucketKey, failed: _Bucket):
+        """
+        Put the rows of a bucket whose write failed back in front of *key*.
+
+        The rows are copied into the live buffer (or a pooled one) rather
+        than reinstating *failed*: a traceback may still hold numpy views of
+        its arrays, and an exported ``array`` cannot grow.  *failed* is
+        therefore never returned to the pool.
+        """
+        n = failed.n
+        buf = self.buffers.get(key)
+        if buf is None:
+            pool = self._buf_pool[failed.ev]
+            buf = self.buffers[key] = pool.pop() if pool else _Bucket(failed.ev)
+        for col, old in zip(buf.nums, failed.nums):
+            col[0:0] = old[:n]
+        for col, old in zip(buf.objs, failed.objs):
+            col[0:0] = old
+        buf.n += n
+
+    def _release(self, buf: _Bucket):
+        pool = self._buf_pool[buf.ev]
+        if len(pool) < _POOL_CAP:
+            buf.n = 0
+            for col in buf.objs:  # object refs (ladders!) are not worth keeping
+                col.clear()
+            pool.append(buf)
 
     # ------------------------------------------------------------------ #
     async def periodic_flush(self):
         """Call periodically (e.g., once per minute) to flush finished buckets."""
-        now = datetime.now(tz=timezone.utc)
-        threshold = now - timedelta(minutes=self.rotate)
-        to_flush = [k for k in self.buffers if _is_bucket_older(k, threshold)]
-        for k in to_flush:
-            async with self._locks[k]:
-                await self._flush(k)
-
-
-def _is_bucket_older(key: str, threshold: datetime) -> bool:
-    *_, label = key.split("|")
-    dt = datetime.strptime(label, "%Y-%m-%d_%H-%M")
-    return dt < threshold
+        threshold = time.time_ns() // 1_000_000 - self._bucket_ms
+        self._pending.update(k for k in self.buffers if k[2] * self._bucket_ms < threshold)
+        await self._drain()
+
+    async def flush_all(self):
+        """Write every buffered bucket (shutdown); failures are logged, not raised."""
+        self._pending.update(self.buffers)
+        await self._drain()
+
+    def close(self):
+        """Wait for in‑flight writes and stop the writer threads."""
+        self._io_pool.shutdown(wait=True)
+
+
+def _levels(prices: Optional[np.ndarray], qtys: Optional[np.ndarray]) -> Optional[List[Tuple[float, float]]]:
+    """One ladder as *(price, qty)* tuples (the CSV cell form)."""
+    if prices is None:
+        return None
+    return list(zip(prices.tolist(), qtys.tolist()))
+
+
+def _ladder_array(prices: List[Optional[np.ndarray]], qtys: List[Optional[np.ndarray]]) -> "pa.ListArray":
+    """
+    ``list<list<double>>`` of *[price, qty]* levels from per‑row arrays.
+
+    All rows are concatenated and interleaved in numpy; Arrow gets the flat
+    values plus offsets, so no per‑level Python object is created.  Rows
+    without a ladder become nulls.
+    """
+    live = [i for i, p in enumerate(prices) if p is not None]
+    sizes = np.zeros(len(prices), dtype=np.int32)
+    sizes[live] = [len(prices[i]) for i in live]
+    offsets = np.zeros(len(prices) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    flat = np.empty((offsets[-1], 2), dtype=np.float64)
+    if live:
+        flat[:, 0] = np.concatenate([prices[i] for i in live])
+        flat[:, 1] = np.concatenate([qtys[i] for i in live])
+    levels = pa.ListArray.from_arrays(
+        pa.array(np.arange(0, flat.size + 1, 2, dtype=np.int32)), pa.array(flat.ravel()))
+    missing = None
+    if len(live) < len(prices):
+        missing = np.ones(len(prices), dtype=bool)
+        missing[live] = False
+    return pa.ListArray.from_arrays(pa.array(offsets), levels,
+                                    mask=None if missing is None else pa.array(missing))
+
+
+def _write_parquet(table, out_file: Path, compression: str) -> None:
+    """Encode *table* in memory, then hand the file to the kernel in one write."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression=compression)
+    buf = memoryview(sink.getvalue())
+    fd = os.open(out_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while buf:  # os.write may be partial for very large shards
+            buf = buf[os.write(fd, buf):]
+    finally:
+        os.close(fd)
+
+
+def _write_csv(out_file: Path, fields: Optional[List[str]], cols: Dict, n: int) -> List[str]:
+    """
+    Append the first *n* rows of *cols* to *out_file*; returns its column order.
+
+    *fields* is the order cached from an earlier flush.  Without it the file
+    is inspected through the open handle (no separate ``stat``): an empty
+    file gets a fresh sorted header, an existing one (e.g. from before a
+    restart) has its header read back.
+    """
+    with open(out_file, "a+", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        w = csv.writer(fh)
+        if fields is None:
+            if fh.tell() == 0:
+                fields = sorted(cols)
+                w.writerow(fields)
+            else:
+                fh.seek(0)
+                fields = next(csv.reader([fh.readline()]), [])
+        # stale slots past n in reused arrays are never read
+        w.writerows(islice(zip(*(cols.get(f, repeat(None)) for f in fields)), n))
+    return fields
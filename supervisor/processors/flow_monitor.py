@@ -1,11 +1,16 @@
 import time, logging
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, List
 from prometheus_client import Counter   # pip install prometheus-client
 
+from supervisor.events import TradeEvent
 from .rolling_window import RollingWindowMixin
 
 logger = logging.getLogger(__name__)
 
+# aggressor side → sign of its notional (anything but "buy" counts as selling)
+_SIGN = {"buy": 1.0, "sell": -1.0}
+
 class FlowImbalanceMonitor(RollingWindowMixin):
     """
     Computes signed notional imbalance over a rolling window and
@@ -18,39 +23,65 @@ class FlowImbalanceMonitor(RollingWindowMixin):
         self.th            = cfg["threshold"]
         self.min_notional  = cfg["min_notional"]
         self.cooldown_ms   = cfg["cooldown_ms"]
-        self.last_alert: Dict[str, int] = {}
+        self.last_alert: Dict[str, int] = {}   # sym -> monotonic ms of last alert
+        # window = the mixin's timestamp / signed‑notional deques plus its
+        # running [signed, gross] notional, per symbol
+        self._totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
         self._alert_engine = alert_engine
         self._metric       = Counter(  # Prometheus
             "flow_alert_total", "flow imbalance alerts", ["symbol"]
         )
+        self._fired: Dict[str, Counter] = {}   # sym -> labelled counter
+        self._w_s = f"{self.window_ms/1000:.0f}"  # alert text, formatted once
 
-    async def add(self, trade: Dict):
-        sym = trade["symbol"]
-        ts  = trade["timestamp"]
-        notion = float(trade["qty"]) * float(trade["price"])
-        notion = notion if trade["side"] == "buy" else -notion
+    async def add(self, trade: TradeEvent):
+        sym = trade.symbol
+        ts  = trade.timestamp
+        notion = trade.qty * trade.price * _SIGN.get(trade.side, -1.0)
 
-        dq = self._push(sym, ts, notion)
-        gross = sum(abs(v) for _, v in dq)
+        signed, gross = self._push_totals(sym, ts, notion)
         if gross < self.min_notional:
             return
-        imb = sum(v for _, v in dq) / gross         # [-1, +1]
+        imb = signed / gross                        # [-1, +1]
 
         if abs(imb) < self.th:
             return
 
-        now = int(time.time() * 1000)
-        if now - self.last_alert.get(sym, 0) < self.cooldown_ms:
+        now = time.monotonic_ns() // 1_000_000  # integer ms, no float / wall clock
+        if now - self.last_alert.get(sym, -self.cooldown_ms) < self.cooldown_ms:
             return
 
         self.last_alert[sym] = now
         side = "buy" if imb > 0 else "sell"
         pct  = f"{imb:+.0%}"
         alert = {
-            "subject": f"{sym} {side}-flow {pct} (window {self.window_ms/1000:.0f}s)",
+            "subject": f"{sym} {side}-flow {pct} (window {self._w_s}s)",
             "message": f"Signed notional imbalance = {pct} during the last "
-                       f"{self.window_ms/1000:.0f} seconds."
+                       f"{self._w_s} seconds."
         }
         logger.info("Flow alert queued: %s", alert["subject"])
-        self._metric.labels(sym).inc()
-        await self._alert_engine.send(alert)
+        ctr = self._fired.get(sym)
+        if ctr is None:
+            ctr = self._fired[sym] = self._metric.labels(sym)
+        ctr.inc()
+        self._alert_engine.enqueue(alert)  # mailed in the background
+
+    def _push_totals(self, sym: str, ts: int, notion: float):
+        """Append to the window and return its (signed, gross) sums in O(1) amortised."""
+        tq = self._ts[sym]
+        vq = self._vals[sym]
+        tot = self._totals[sym]
+        tq.append(ts)
+        vq.append(notion)
+        signed = tot[0] + notion
+        gross = tot[1] + abs(notion)
+        cut = ts - self.window_ms
+        while tq[0] < cut:
+            tq.popleft()
+            v = vq.popleft()
+            signed -= v
+            gross -= abs(v)
+        if len(tq) == 1:  # re‑anchor so rounding drift can't outlive the window
+            signed, gross = notion, abs(notion)
+        tot[0], tot[1] = signed, gross
+        return signed, gross
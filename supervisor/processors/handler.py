@@ -1,19 +1,23 @@
 # supervisor/processors/handler.py   –   TickHandler v4
 # ------------------------------------------------------
 # * ticker  → price‑move alerts (unchanged)
-# * trade   → FlowImbalanceMonitor
-# * depth   → SpreadStressMonitor [+ QueueImbalanceMonitor]
-# * writes every tick to FileSink
+# * trade   → FlowImbalanceMonitor (if alerts.flow is configured)
+# * depth   → SpreadStressMonitor (if alerts.spread) + QueueImbalanceMonitor
+# * writes every tick to FileSink via a bounded queue drained in batches
+#   by one writer task (drop‑oldest)
 # * supports Redis or in‑memory store
-# * retry‑aware e‑mail dispatch
+# * retry‑aware e‑mail dispatch (jittered exponential backoff)
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, Tuple
+import random
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
 
 from supervisor.alerts.engine        import AlertEngine
+from supervisor.events               import DepthEvent, Event, TickerEvent
 from supervisor.storage.memory       import MemoryStore
 from supervisor.storage.redis_store  import RedisStore
 from supervisor.processors.file_sink import FileSink
@@ -27,8 +31,11 @@ logger = logging.getLogger(__name__)
 
 
 class TickHandler:
-    RETRY_DELAY_S = 5
+    RETRY_BASE_S  = 5        # full‑jitter backoff: sleep U(0, base·2^attempt)
+    RETRY_MAX_S   = 30
     MAX_RETRIES   = 2
+    SINK_QUEUE    = 65_536   # events buffered ahead of FileSink
+    SINK_BATCH    = 1_024    # events handed to FileSink.add_many at once
 
     # ------------------------------------------------------------------ #
     # init                                                               #
@@ -38,102 +45,189 @@ class TickHandler:
         st_conf  = config.get("storage", {})
         backend  = st_conf.get("backend", "memory").lower()
         sink_cfg = st_conf.get("sink", {})
-        self.file_sink = FileSink(**sink_cfg)
 
         if backend == "redis":
             self.store = RedisStore(
                 redis_url       = st_conf.get("redis_url", "redis://localhost:6379/0"),
                 max_memory_bytes= int(st_conf.get("max_memory_gb", 8)) * 1024 ** 3,
                 hot_window_ms   = int(st_conf.get("hot_window_hours", 24)) * 3600 * 1000,
+                pool_size       = st_conf.get("redis_pool_size"),
             )
         else:
             self.store = MemoryStore()
 
-        # ---------- alert engine & processors -------------------------- #
-        self.alert_engine = AlertEngine(config.get("alerts", {}))
+        self.file_sink = FileSink(**sink_cfg)
+        # ticks reach the sink through this queue; the writer task starts
+        # with the first tick (no running loop yet while __init__ runs)
+        self.sink_q: asyncio.Queue = asyncio.Queue(self.SINK_QUEUE)
+        self._sink_task: Optional[asyncio.Task] = None
+        self.sink_dropped = 0
 
-        flow_cfg   = config["alerts"].get("flow",   {})
-        spread_cfg = config["alerts"].get("spread", {})
+        # ---------- alert engine & processors -------------------------- #
+        pairs = [
+            (exch, sym)
+            for exch, params in config.get("exchanges", {}).items()
+            for sym in params.get("symbols", [])
+        ]
+        self.alert_engine = AlertEngine(
+            config.get("alerts", {}), pairs, on_alerts=self._dispatch_alerts,
+        )
+
+        # flow / spread monitors run only when their block is configured
+        flow_cfg   = config["alerts"].get("flow")
+        spread_cfg = config["alerts"].get("spread")
         queue_cfg  = config["alerts"].get("queue",  {   # optional new block
             "threshold":   0.7,
             "window_ms":   3000,
             "cooldown_ms": 600_000,
         })
 
-        self.flow_mon   = FlowImbalanceMonitor(flow_cfg,   self.alert_engine)
-        self.spread_mon = SpreadStressMonitor(spread_cfg,  self.alert_engine)
+        self.flow_mon   = FlowImbalanceMonitor(flow_cfg, self.alert_engine) if flow_cfg else None
+        self.spread_mon = SpreadStressMonitor(spread_cfg, self.alert_engine) if spread_cfg else None
         self.qi_mon     = QueueImbalanceMonitor(queue_cfg, self.alert_engine)
+        self._depth_mons = [m for m in (self.spread_mon, self.qi_mon) if m is not None]
+
+        # event type → coroutine; anything unknown takes the ticker path
+        self._routes = {
+            "trade":  self.flow_mon.add if self.flow_mon else self._ignore,  # order‑flow imbalance
+            "depth":  self._handle_depth,    # spread & queue monitors
+            "ticker": self._handle_ticker,   # price‑move alerts
+        }
 
-        self._sem: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # per pair: alert batches waiting to be mailed + the task mailing them
+        self._outq: Dict[Tuple[str, str], Deque[List[Dict[str, str]]]] = defaultdict(deque)
+        self._senders: Dict[Tuple[str, str], asyncio.Task] = {}
 
     # ------------------------------------------------------------------ #
     # public async API                                                   #
     # ------------------------------------------------------------------ #
-    async def handle_tick(self, data: Dict):
+    async def handle_tick(self, data: Union[Event, List[Event]]):
         """
-        Receives one normalised event dict from any connector.
+        Receives one normalised event, or a batch (list) of them, from any
+        connector (see :mod:`supervisor.events`).
 
-        * ticker  → {"event":"ticker", ...}
-        * trade   → {"event":"trade",  ...}
-        * depth   → {"event":"depth",  ...}
+        * ticker  → TickerEvent
+        * trade   → TradeEvent
+        * depth   → DepthEvent
         """
+        if isinstance(data, list):
+            for item in data:
+                await self._handle_one(item)
+        else:
+            await self._handle_one(data)
 
+    async def _handle_one(self, data: Event):
         try:
-            # 1) write raw tick to disk
-            await self.file_sink.add(data)
+            # 1) queue raw tick for disk
+            self._to_sink(data)
 
-            event = data.get("event", "ticker")
+            # 2) route by event type
+            await self._routes.get(data.event, self._handle_ticker)(data)
 
-            # ------ trade: order‑flow imbalance ---------------------- #
-            if event == "trade":
-                await self.flow_mon.add(data)
-                return  # no need to feed ticker logic
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Error in handle_tick(): %s", exc)
 
-            # ------ depth: spread & queue monitors ------------------- #
-            if event == "depth":
-                await self.spread_mon.add(data)
-                await self.qi_mon.add(data)
-                return
+    async def drain_sink(self):
+        """Stop the sink writer and hand everything still queued to FileSink."""
+        if self._sink_task is not None:
+            self._sink_task.cancel()
+            await asyncio.gather(self._sink_task, return_exceptions=True)
+            self._sink_task = None
+        batch = []
+        while not self.sink_q.empty():
+            batch.append(self.sink_q.get_nowait())
+        await self.file_sink.add_many(batch)
+
+    async def drain_alerts(self, timeout: float = 10.0):
+        """Shutdown: mail every queued alert (engine outbox and per‑pair senders)."""
+        await self.alert_engine.aclose(timeout)
+        senders = [t for t in self._senders.values() if not t.done()]
+        if senders:
+            _, late = await asyncio.wait(senders, timeout=timeout)
+            for task in late:
+                task.cancel()
+
+    def _to_sink(self, data: Event):
+        if self._sink_task is None:
+            self._sink_task = asyncio.create_task(self._sink_loop(), name="file_sink.writer")
+        q = self.sink_q
+        if q.full():  # writer behind: shed the oldest tick, keep the newest
+            q.get_nowait()
+            self.sink_dropped += 1
+            if self.sink_dropped == 1 or self.sink_dropped % 10_000 == 0:
+                logger.warning("Sink queue full – %d tick(s) dropped so far", self.sink_dropped)
+        q.put_nowait(data)
+
+    async def _sink_loop(self):
+        q = self.sink_q
+        while True:
+            batch = [await q.get()]
+            while not q.empty() and len(batch) < self.SINK_BATCH:
+                batch.append(q.get_nowait())
+            try:
+                await self.file_sink.add_many(batch)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Error in FileSink.add_many(): %s", exc)
 
-            # ------ ticker: price‑move alerts ------------------------ #
-            exch: str = data["exchange"]
-            sym:  str = data["symbol"]
-            ts:   int = int(data.get("timestamp", 0))
+    async def _handle_depth(self, data: DepthEvent):
+        for mon in self._depth_mons:
+            await mon.add(data)
 
-            try:
-                price = float(data["price"])
-            except (TypeError, ValueError):
-                return  # malformed ticker payload
-
-            # update last price cache
-            self.store.update(exch, sym, price, ts)
-            logger.debug("Stored %s %s @ %s", exch, sym, price)
-
-            # evaluate alert thresholds configured in YAML
-            alerts = self.alert_engine.check(exch, sym, price, ts)
-            if alerts:
-                sem = self._sem.setdefault((exch, sym), asyncio.Lock())
-                async with sem:
-                    for alert in alerts:
-                        await self._dispatch_with_retry(alert)
+    async def _ignore(self, data: Event):
+        """Route for events whose monitor is not configured (still archived)."""
 
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Error in handle_tick(): %s", exc)
+    async def _handle_ticker(self, data: TickerEvent):
+        # update last price cache
+        self.store.update(data.exchange, data.symbol, data.price, data.timestamp)
+
+        # evaluate alert thresholds configured in YAML (in the engine's
+        # background feed task; hits come back via _dispatch_alerts)
+        self.alert_engine.feed(data.exchange, data.symbol, data.price, data.timestamp)
 
     # ------------------------------------------------------------------ #
     # helpers                                                            #
     # ------------------------------------------------------------------ #
-    async def _dispatch_with_retry(self, alert: Dict[str, str]):
-        """Send an e‑mail alert; retry up to MAX_RETRIES times."""
+    async def _dispatch_alerts(self, exch: str, sym: str, alerts: List[Dict[str, str]]):
+        """Queue one pair's alerts; a single sender per pair mails them in order."""
+        key = (exch, sym)
+        self._outq[key].append(alerts)
+        task = self._senders.get(key)
+        if task is None or task.done():
+            self._senders[key] = asyncio.create_task(
+                self._drain_alerts(key), name=f"alerts.send[{exch}:{sym}]"
+            )
+
+    async def _drain_alerts(self, key: Tuple[str, str]):
+        """Mail everything queued for *key*; batches that arrive meanwhile go out next."""
+        q = self._outq[key]
+        while q:
+            alerts = [alert for batch in q for alert in batch]
+            q.clear()
+            try:
+                await self._dispatch_with_retry(alerts)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Alert dispatch for %s:%s failed: %s", *key, exc)
+
+    async def _dispatch_with_retry(self, alerts: List[Dict[str, str]]):
+        """Send e‑mail alerts as one batch; retry the failed ones up to MAX_RETRIES times.
+
+        Retries back off with full jitter, so alerts that failed together
+        don't all hit a recovering relay at the same instant.
+        """
         for attempt in range(1 + self.MAX_RETRIES):
-            if await self.alert_engine.send(alert):
+            results = await self.alert_engine.send_many(alerts)
+            alerts = [alert for alert, ok in zip(alerts, results) if not ok]
+            if not alerts:
                 return
+            delay = random.uniform(0, min(self.RETRY_MAX_S, self.RETRY_BASE_S * (1 << attempt)))
             logger.warning(
-                "E‑mail attempt %d/%d failed – retrying in %ds",
+                "E‑mail attempt %d/%d failed for %d alert(s) – retrying in %.1fs",
                 attempt + 1,
                 self.MAX_RETRIES + 1,
-                self.RETRY_DELAY_S,
+                len(alerts),
+                delay,
             )
-            await asyncio.sleep(self.RETRY_DELAY_S)
+            await asyncio.sleep(delay)
 
-        logger.error("Giving up on alert: %s", alert["subject"])
+        for alert in alerts:
+            logger.error("Giving up on alert: %s", alert["subject"])
@@ -1,6 +1,7 @@
-import time, logging
+import logging
 from typing import Dict
 
+from supervisor.events import DepthEvent
 from .rolling_window import RollingWindowMixin
 
 logger = logging.getLogger(__name__)
@@ -11,30 +12,36 @@ class QueueImbalanceMonitor(RollingWindowMixin):
     def __init__(self, cfg: Dict, alert_engine):
         super().__init__(cfg["window_ms"])
         self.th           = cfg["threshold"]      # e.g. 0.7
+        self._weak        = lambda v: -self.th < v < self.th   # |v| below threshold
         self.cooldown_ms  = cfg["cooldown_ms"]
-        self.last_alert: Dict[str, int] = {}
+        self.last_alert: Dict[str, int] = {}   # sym -> event ts (ms) of last alert
         self._alert_engine = alert_engine
+        # alert text pieces, formatted once
+        self._pct = f"{self.th:.0%}"
+        self._w_s = f"{self.window_ms/1000:.0f}"
 
-    async def add(self, depth: Dict):
-        sym  = depth["symbol"]
-        ts   = depth["timestamp"]
-        bidq = depth["best_bid"][1] if depth["best_bid"] else 0
-        askq = depth["best_ask"][1] if depth["best_ask"] else 0
-        if bidq + askq == 0:
+    async def add(self, depth: DepthEvent):
+        sym  = depth.symbol
+        ts   = depth.timestamp
+        bb   = depth.best_bid
+        ba   = depth.best_ask
+        bidq = bb[1] if bb else 0
+        askq = ba[1] if ba else 0
+        tot  = bidq + askq
+        if tot == 0:
             return
-        q = (bidq - askq) / (bidq + askq)        # [-1, +1]
-        dq = self._push(sym, ts, q)
+        q = (bidq - askq) / tot                  # [-1, +1]
+        self._push(sym, ts, q, self._weak)
 
-        if dq and all(abs(v) >= self.th for _, v in dq):
-            now = int(time.time() * 1000)
-            if now - self.last_alert.get(sym, 0) < self.cooldown_ms:
+        if self._fails[sym] == 0:  # every sample in the window ≥ threshold
+            now = ts  # exchange event time: no clock read, replayable
+            if now - self.last_alert.get(sym, -self.cooldown_ms) < self.cooldown_ms:
                 return
             self.last_alert[sym] = now
-            side = "buy" if dq[-1][1] > 0 else "sell"
-            pct = f"{self.th:.0%}"
+            side = "buy" if q > 0 else "sell"
             alert = {
-                "subject": f"{sym} persistent {side}-side queue imbalance ≥{pct}",
-                "message": f"Level-1 queue imbalance exceeded {pct} for {self.window_ms/1000:.0f}s."
+                "subject": f"{sym} persistent {side}-side queue imbalance ≥{self._pct}",
+                "message": f"Level-1 queue imbalance exceeded {self._pct} for {self._w_s}s."
             }
             logger.info("QI alert queued: %s", alert["subject"])
-            await self._alert_engine.send(alert)
+            self._alert_engine.enqueue(alert)  # mailed in the background
@@ -1,20 +1,53 @@
 from collections import defaultdict, deque
-from typing import Deque, Dict, Tuple
+from typing import Callable, Deque, Dict, Optional, Tuple
 
 class RollingWindowMixin:
     """
-    Helper that maintains a per‑symbol deque of (timestamp, value)
-    clipped to a rolling time window (ms).
+    Helper that maintains per‑symbol parallel deques of timestamps and
+    values clipped to a rolling time window (ms) – no tuple per sample.
+
+    Pass ``fails=`` to ``_push`` and ``_fails[sym]`` counts the in‑window
+    samples for which the predicate holds, kept current on push and
+    eviction – "every sample passes" becomes ``_fails[sym] == 0``.
+
+    ``_push_max`` keeps a monotonic deque instead (values strictly
+    decreasing front to back), so the window maximum is its first entry
+    – amortised O(1) per push instead of a scan over the window.
     """
 
     def __init__(self, window_ms: int):
         self.window_ms = window_ms
-        self._hist: Dict[str, Deque[Tuple[int, float]]] = defaultdict(deque)
+        self._ts: Dict[str, Deque[int]] = defaultdict(deque)
+        self._vals: Dict[str, Deque[float]] = defaultdict(deque)
+        self._fails: Dict[str, int] = defaultdict(int)
+        self._mono: Dict[str, Deque[Tuple[int, float]]] = defaultdict(deque)
+
+    def _push(self, sym: str, ts: int, val: float,
+              fails: Optional[Callable[[float], bool]] = None):
+        """Add a sample; returns the symbol's value deque (window order)."""
+        tq, vq = self._ts[sym], self._vals[sym]
+        tq.append(ts)
+        vq.append(val)
+        cut = ts - self.window_ms
+        if fails is None:
+            while tq[0] < cut:
+                tq.popleft()
+                vq.popleft()
+            return vq
+        n = self._fails[sym] + fails(val)
+        while tq[0] < cut:
+            tq.popleft()
+            n -= fails(vq.popleft())
+        self._fails[sym] = n
+        return vq
 
-    def _push(self, sym: str, ts: int, val: float):
-        dq = self._hist[sym]
-        dq.append((ts, val))
+    def _push_max(self, sym: str, ts: int, val: float) -> float:
+        """Add a sample and return the maximum value in the window."""
+        mono = self._mono[sym]
+        while mono and mono[-1][1] <= val:
+            mono.pop()  # can never be the max again
+        mono.append((ts, val))
         cut = ts - self.window_ms
-        while dq and dq[0][0] < cut:
-            dq.popleft()
-        return dq
+        while mono[0][0] < cut:
+            mono.popleft()
+        return mono[0][1]
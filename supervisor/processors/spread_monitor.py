@@ -1,7 +1,8 @@
-import time, logging
+import logging
 from typing import Dict
 from prometheus_client import Counter
 
+from supervisor.events import DepthEvent
 from .rolling_window import RollingWindowMixin
 
 logger = logging.getLogger(__name__)
@@ -13,37 +14,45 @@ class SpreadStressMonitor(RollingWindowMixin):
         super().__init__(cfg["window_ms"])
         self.th_bps      = cfg["threshold_bps"]
         self.cooldown_ms = cfg["cooldown_ms"]
-        self.last_alert: Dict[str, int] = {}
+        self.last_alert: Dict[str, int] = {}   # sym -> event ts (ms) of last alert
         self._alert_engine = alert_engine
         self._metric = Counter(
             "spread_alert_total", "spread‑widen alerts", ["symbol"]
         )
-
-    async def add(self, depth: Dict):
-        sym = depth["symbol"]
-        ts  = depth["timestamp"]
-        bid = depth["best_bid"][0] if depth["best_bid"] else None
-        ask = depth["best_ask"][0] if depth["best_ask"] else None
-        if bid is None or ask is None:
+        self._fired: Dict[str, Counter] = {}   # sym -> labelled counter
+        self._w_s = f"{self.window_ms/1000:.0f}"  # alert text, formatted once
+
+    async def add(self, depth: DepthEvent):
+        sym = depth.symbol
+        ts  = depth.timestamp
+        bb  = depth.best_bid
+        ba  = depth.best_ask
+        if not bb or not ba:
+            return
+        bid = bb[0]
+        ask = ba[0]
+        s = bid + ask
+        if not s:
             return
-        mid = (bid + ask) / 2
-        spread_bps = 1e4 * (ask - bid) / mid
+        spread_bps = 2e4 * (ask - bid) / s   # = 1e4·(ask−bid)/mid, one division
 
-        dq = self._push(sym, ts, spread_bps)
-        worst = max(v for _, v in dq)
+        worst = self._push_max(sym, ts, spread_bps)
         if worst < self.th_bps:
             return
 
-        now = int(time.time() * 1000)
-        if now - self.last_alert.get(sym, 0) < self.cooldown_ms:
+        now = ts  # exchange event time: no clock read, replayable
+        if now - self.last_alert.get(sym, -self.cooldown_ms) < self.cooldown_ms:
             return
 
         self.last_alert[sym] = now
         alert = {
             "subject": f"{sym} spread {worst:.0f} bp (liquidity stress)",
             "message": f"Spread peaked at ≈{worst:.1f} bp during the last "
-                       f"{self.window_ms/1000:.0f} seconds."
+                       f"{self._w_s} seconds."
         }
         logger.info("Spread alert queued: %s", alert["subject"])
-        self._metric.labels(sym).inc()
-        await self._alert_engine.send(alert)
+        ctr = self._fired.get(sym)
+        if ctr is None:
+            ctr = self._fired[sym] = self._metric.labels(sym)
+        ctr.inc()
+        self._alert_engine.enqueue(alert)  # mailed in the background
@@ -7,10 +7,19 @@ Notes
   so Python’s GIL already serialises byte‑code execution.
 * Each public method performs only a handful of atomic dict operations;
   these are inherently thread‑safe with respect to the GIL.
+* Records are :class:`Tick` named tuples (shared with ``RedisStore``) –
+  no per‑update dict, and ``tick.price`` / ``tick.timestamp`` to read.
 """
 
 import time
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class Tick(NamedTuple):
+    """Latest price of one pair."""
+
+    price: float
+    timestamp: int  # epoch‑ms
 
 
 class MemoryStore:
@@ -18,8 +27,8 @@ class MemoryStore:
     Simple in‑memory storage for the latest tick data.
     """
 
-    # exchange -> symbol -> {"price": float, "timestamp": int}
-    _store: Dict[str, Dict[str, Dict[str, float | int]]]
+    # (exchange, symbol) -> Tick(price, timestamp)
+    _store: Dict[Tuple[str, str], Tick]
 
     def __init__(self):
         self._store = {}
@@ -44,10 +53,9 @@ class MemoryStore:
         price    : float
         timestamp: int | None   – epoch‑ms; if None, use current time
         """
-        ts = timestamp or int(time.time() * 1000)
+        ts = timestamp or time.time_ns() // 1_000_000
 
-        ex_store = self._store.setdefault(exchange, {})
-        ex_store[symbol] = {"price": price, "timestamp": ts}
+        self._store[(exchange, symbol)] = Tick(price, ts)
 
     def get_latest(self, exchange: str, symbol: str):
         """
@@ -55,12 +63,20 @@ class MemoryStore:
 
         Returns
         -------
-        dict with keys {"price", "timestamp"} or None if absent.
+        Tick(price, timestamp) or None if absent.
         """
-        return self._store.get(exchange, {}).get(symbol)
+        return self._store.get((exchange, symbol))
+
+    async def fetch_latest(self, exchange: str, symbol: str):
+        """Awaitable :meth:`get_latest` – same call as ``RedisStore.fetch_latest``."""
+        return self._store.get((exchange, symbol))
 
     def get_all(self):
         """
-        Return a *shallow* snapshot of the current store.
+        Return a *shallow* snapshot of the current store, grouped as
+        exchange -> symbol -> record.
         """
-        return {ex: syms.copy() for ex, syms in self._store.items()}
+        out: Dict[str, Dict[str, Tick]] = {}
+        for (ex, sym), data in self._store.items():
+            out.setdefault(ex, {})[sym] = data
+        return out
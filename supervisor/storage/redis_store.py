@@ -4,17 +4,39 @@ RedisStore  –  hybrid tick store: hot data in RAM, cold data in Redis.
 Requirements
 ------------
 pip install redis psutil
+
+Redis is reached through ``redis.asyncio`` only, so the event loop never
+blocks on a socket: evictions run as a background task.  ``get_latest``
+(like ``MemoryStore.get_latest``) answers from RAM only; the coroutine
+``fetch_latest`` falls back to Redis for evicted pairs.  Connections come from a blocking pool of
+``pool_size`` (default ``REDIS_POOL_SIZE`` or 50): a burst waits up to
+``pool_timeout`` seconds for a free connection instead of failing.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
 import time
 from typing import Dict, Optional, Tuple
 
 import psutil          # to sample process memory
-import redis
+import redis.asyncio as aioredis
+
+from supervisor.storage.memory import Tick
+
+try:  # C JSON codec; Redis takes its bytes as they are
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
 # helpers                                                                     #
@@ -31,22 +53,35 @@ class RedisStore:
     Keeps *latest* tick for every pair in an in‑process dict for speed.
     When the Python process exceeds ``max_memory_bytes`` (default 8 GiB),
     any entry whose timestamp is older than ``hot_window_ms`` is flushed
-    to Redis and removed from the local dict.
+    to Redis and removed from the local dict.  RSS is sampled once every
+    ``EVICT_CHECK_EVERY`` updates, not per tick.
     """
 
+    EVICT_CHECK_EVERY = 1024  # updates between RSS samples (power of two)
+
     def __init__(
         self,
         redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0"),
         max_memory_bytes: int = 8 * 1024 * 1024 * 1024,  # 8 GiB
         hot_window_ms: int = 24 * 3600 * 1000,            # 24 h
+        pool_size: Optional[int] = None,                  # None → $REDIS_POOL_SIZE or 50
+        pool_timeout: float = 5.0,                        # s to wait for a connection
     ):
-        self._local: Dict[Tuple[str, str], Dict[str, float | int]] = {}
-        self._r = redis.from_url(redis_url)
+        self._local: Dict[Tuple[str, str], Tick] = {}
+        pool = aioredis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=pool_size or int(os.getenv("REDIS_POOL_SIZE", "50")),
+            timeout=pool_timeout,
+        )
+        self._r = aioredis.Redis(connection_pool=pool)
         self._max_bytes = max_memory_bytes
         self._hot_ms = hot_window_ms
+        self._evicting: Optional[asyncio.Task] = None
+        self._proc = psutil.Process()
+        self._updates = 0
 
     # ------------------------------------------------------------------ #
-    # public API (same signature as MemoryStore)                          #
+    # public API (update / get_latest / get_all as in MemoryStore)       #
     # ------------------------------------------------------------------ #
     def update(
         self,
@@ -55,57 +90,80 @@ class RedisStore:
         price: float,
         timestamp: Optional[int] = None,
     ):
-        ts = timestamp or int(time.time() * 1000)
-        self._local[(exchange, symbol)] = {"price": price, "timestamp": ts}
+        ts = timestamp or time.time_ns() // 1_000_000
+        self._local[(exchange, symbol)] = Tick(price, ts)
         self._maybe_evict()
 
-    def get_latest(self, exchange: str, symbol: str):
+    def get_latest(self, exchange: str, symbol: str) -> Optional[Tick]:
+        """Latest tick from RAM (None if absent or evicted – see :meth:`fetch_latest`)."""
+        return self._local.get((exchange, symbol))
+
+    async def fetch_latest(self, exchange: str, symbol: str) -> Optional[Tick]:
+        """Latest tick, reading Redis when the pair was evicted from RAM."""
         # 1️⃣ RAM first
         item = self._local.get((exchange, symbol))
         if item:
             return item
 
         # 2️⃣ otherwise try Redis
-        raw = self._r.get(_redis_key(exchange, symbol))
+        raw = await self._r.get(_redis_key(exchange, symbol))
         if raw is None:
             return None
-        return json.loads(raw)
+        return Tick(**_loads(raw))
 
     def get_all(self):
         """
-        Snapshot of currently *hot* data (RAM only, quick).
+        Snapshot of currently *hot* data (RAM only, quick): one pass over
+        the local dict, records shared rather than copied.
         """
-        return {
-            ex: {
-                sym: data
-                for (ex_, sym), data in self._local.items()
-                if ex_ == ex
-            }
-            for ex, _ in self._local.keys()
-        }
+        out: Dict[str, Dict[str, Tick]] = {}
+        for (ex, sym), data in self._local.items():
+            out.setdefault(ex, {})[sym] = data
+        return out
 
     # ------------------------------------------------------------------ #
     # internal helpers                                                   #
     # ------------------------------------------------------------------ #
     def _maybe_evict(self):
         """
-        If this process is using > max_memory_bytes, move cold entries
-        (older than hot_window_ms) to Redis and delete them locally.
+        If this process is using > max_memory_bytes, start moving cold
+        entries (older than hot_window_ms) to Redis in the background.
         """
-        proc = psutil.Process()
-        if proc.memory_info().rss < self._max_bytes:
+        self._updates += 1
+        if self._updates & (self.EVICT_CHECK_EVERY - 1):
             return
+        if self._evicting is not None and not self._evicting.done():
+            return  # one eviction at a time
 
-        cutoff = int(time.time() * 1000) - self._hot_ms
-        victims = [
-            key for key, data in self._local.items() if data["timestamp"] < cutoff
-        ]
+        if self._proc.memory_info().rss < self._max_bytes:
+            return
+
+        cutoff = time.time_ns() // 1_000_000 - self._hot_ms
+        victims = {
+            key: data for key, data in self._local.items() if data.timestamp < cutoff
+        }
 
         if not victims:
             return
 
-        with self._r.pipeline() as pipe:
-            for ex, sym in victims:
-                data = self._local.pop((ex, sym))
-                pipe.set(_redis_key(ex, sym), json.dumps(data))
-            pipe.execute()
+        self._evicting = asyncio.create_task(self._evict(victims), name="redis_store.evict")
+
+    async def _evict(self, victims: Dict[Tuple[str, str], Tick]):
+        """
+        Write *victims* to Redis in one ``MSET``, then drop the local copies
+        that were not updated meanwhile (until then reads are still served
+        from RAM).
+        """
+        payload = {
+            _redis_key(ex, sym): _dumps({"price": t.price, "timestamp": t.timestamp})
+            for (ex, sym), t in victims.items()
+        }
+        try:
+            await self._r.mset(payload)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Redis eviction of %d entries failed: %s", len(victims), exc)
+            return  # entries stay hot; a later update retries
+
+        for key, data in victims.items():
+            if self._local.get(key) is data:
+                del self._local[key]